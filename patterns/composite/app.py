@@ -2,7 +2,14 @@ from abc import ABC, abstractmethod
 from typing import Iterator
 
 
+class FileSystemException(Exception):
+    pass
+
+
 class IFileSystem(ABC):
+    __slots__ = ()
+    parent: "Directory" = None
+
     @abstractmethod
     def get_name(self):
         pass
@@ -15,48 +22,102 @@ class IFileSystem(ABC):
 class File(IFileSystem):
     def __init__(self, name, size):
         self.name = name
-        self.size = size
+        self.parent = None
+        self.__size = size
+
+    @property
+    def size(self):
+        return self.__size
+
+    @size.setter
+    def size(self, value):
+        delta = value - self.__size
+        self.__size = value
+        if self.parent is not None:
+            self.parent._propagate(delta)
 
     def get_name(self):
         return self.name
 
     def get_size(self):
-        return self.size
+        return self.__size
 
 
 class Directory(IFileSystem):
+    # Keeps the aggregate size of its subtree. Adding, removing or resizing a
+    # node pushes the size difference up through its ancestors, so get_size
+    # is O(1) and every change is O(depth).
     def __init__(self, name):
         self.name = name
+        self.parent = None
         self.children = []
+        self.index = None
+        self.__size = 0
 
     def add_child(self, child):
+        indexes = []
+        ancestor = self
+        while ancestor is not None:
+            if ancestor is child:
+                raise FileSystemException(f"Cannot add {child.get_name()} inside itself.")
+            if ancestor.index is not None:
+                indexes.append(ancestor.index)
+            ancestor = ancestor.parent
+        for index in indexes:
+            index.check(self, child)
+        if child.parent is not None:
+            child.parent.remove_child(child)
         self.children.append(child)
+        child.parent = self
+        self._propagate(child.get_size())
+        for index in indexes:
+            index.added(child)
+
+    def remove_child(self, child):
+        if child.parent is not self:
+            raise FileSystemException(f"{child.get_name()} is not in {self.name}.")
+        ancestor = self
+        while ancestor is not None:
+            if ancestor.index is not None:
+                ancestor.index.removed(child)
+            ancestor = ancestor.parent
+        self.children.remove(child)
+        child.parent = None
+        self._propagate(-child.get_size())
 
     def get_name(self):
         return self.name
 
     def get_size(self):
-        total_size = 0
-        for child in self.children:
-            total_size += child.get_size()
-        return total_size
+        return self.__size
+
+    def _propagate(self, delta):
+        directory = self
+        while directory is not None:
+            directory.__size += delta
+            directory = directory.parent
 
     def __iter__(self) -> Iterator[IFileSystem]:
         return iter(self.children)
 
 
-# Usage:
-root_directory = Directory("Root")
-music_directory = Directory("Music")
-documents_directory = Directory("Documents")
-text_file = File("report.txt", 1024)
-image_file = File("photo.jpg", 512)
+if __name__ == "__main__":
+    # Usage:
+    root_directory = Directory("Root")
+    music_directory = Directory("Music")
+    documents_directory = Directory("Documents")
+    text_file = File("report.txt", 1024)
+    image_file = File("photo.jpg", 512)
+
+    root_directory.add_child(music_directory)
+    root_directory.add_child(documents_directory)
+    music_directory.add_child(image_file)
+    documents_directory.add_child(text_file)
 
-root_directory.add_child(music_directory)
-root_directory.add_child(documents_directory)
-music_directory.add_child(image_file)
-documents_directory.add_child(text_file)
+    # Traverse and print information
+    for item in root_directory:
+        print(item.get_name(), item.get_size())
 
-# Traverse and print information
-for item in root_directory:
-    print(item.get_name(), item.get_size())
+    # Resizing a file updates every ancestor's cached size
+    image_file.size = 2048
+    print(root_directory.get_name(), root_directory.get_size())
@@ -0,0 +1,72 @@
+import argparse
+import random
+import time
+
+from app import Directory, File
+
+
+def build(nodes: int, fanout: int) -> Directory:
+    # Breadth-first tree of `nodes` entries: directories with `fanout` children,
+    # files at the bottom level.
+    root = Directory("root")
+    level = [root]
+    created = 1
+    while created < nodes:
+        next_level = []
+        for directory in level:
+            for index in range(fanout):
+                if created >= nodes:
+                    break
+                if created + len(level) * fanout < nodes:
+                    child = Directory(f"dir{created}")
+                    next_level.append(child)
+                else:
+                    child = File(f"file{created}.bin", random.randint(1, 4096))
+                directory.add_child(child)
+                created += 1
+        level = next_level or level
+    return root
+
+
+def recursive_size(node) -> int:
+    # The previous get_size: re-sum every descendant on each call.
+    if isinstance(node, File):
+        return node.size
+    return sum(recursive_size(child) for child in node.children)
+
+
+def directories(root: Directory):
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        yield directory
+        stack.extend(child for child in directory.children if isinstance(child, Directory))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cached vs recursive directory sizes.")
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--fanout", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    root = build(args.nodes, args.fanout)
+    print(f"Built {args.nodes:,} nodes in {time.perf_counter() - started:.2f}s")
+
+    tree = list(directories(root))
+    started = time.perf_counter()
+    cached = [directory.get_size() for directory in tree]
+    cached_time = time.perf_counter() - started
+    started = time.perf_counter()
+    recursive = [recursive_size(directory) for directory in tree]
+    recursive_time = time.perf_counter() - started
+    assert cached == recursive
+    print(f"Size of all {len(tree):,} directories: cached {cached_time * 1000:.1f}ms, recursive {recursive_time * 1000:.1f}ms")
+
+    files = [child for directory in tree for child in directory.children if isinstance(child, File)]
+    sample = random.sample(files, min(100_000, len(files)))
+    started = time.perf_counter()
+    for file in sample:
+        file.size += 1
+    print(f"Resized {len(sample):,} files in {(time.perf_counter() - started) * 1000:.1f}ms")
+    assert root.get_size() == recursive_size(root)
@@ -0,0 +1,179 @@
+import os
+import re
+from typing import Dict, Iterable, List
+
+from app import Directory, FileSystemException, IFileSystem
+from traversal import depth_first
+
+
+class PathIndex:
+    # Hash indexes over one Directory subtree: relative path -> node, plus
+    # name and extension -> {path: node}. The directory keeps the index up to
+    # date from add_child/remove_child, so lookups and globs never walk the
+    # tree. Paths are "/"-separated and relative to the indexed directory.
+    #
+    # Renaming a node in place is not tracked; remove and re-add it instead.
+    def __init__(self, root: Directory) -> None:
+        if root.index is not None:
+            raise FileSystemException(f"{root.get_name()} is already indexed.")
+        self.root = root
+        self.paths: Dict[str, IFileSystem] = {}
+        self.names: Dict[str, Dict[str, IFileSystem]] = {}
+        self.extensions: Dict[str, Dict[str, IFileSystem]] = {}
+        self.__path_of: Dict[int, str] = {id(root): ""}
+        for child in root:
+            self.check(root, child)
+            self.added(child)
+        root.index = self
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def path(self, node: IFileSystem) -> str:
+        return self.__path_of[id(node)]
+
+    def get(self, path: str) -> IFileSystem:
+        node = self.paths.get(path.strip("/"))
+        if node is None:
+            raise FileSystemException(f"No such path: {path}")
+        return node
+
+    def check(self, parent: Directory, child: IFileSystem):
+        # Called before child is attached under parent, while nothing has
+        # changed yet: rejects any path in child's subtree that would clash,
+        # either with the index or with another node of the subtree. Nodes of
+        # the subtree itself may already be indexed when it is being moved.
+        subtree = {id(node) for node in depth_first(child)}
+        paths = {id(parent): self.__path_of[id(parent)]}
+        seen = set()
+        for node in depth_first(child):
+            above = parent if node is child else node.parent
+            path = paths[id(node)] = self.__join(paths[id(above)], node.get_name())
+            existing = self.paths.get(path)
+            if path in seen or (existing is not None and id(existing) not in subtree):
+                raise FileSystemException(f"{path} already exists.")
+            seen.add(path)
+
+    def added(self, child: IFileSystem):
+        # Only called after check() passed, so every path is free.
+        for node in depth_first(child):
+            path = self.__join(self.__path_of[id(node.parent)], node.get_name())
+            self.__path_of[id(node)] = path
+            self.paths[path] = node
+            self.names.setdefault(node.get_name(), {})[path] = node
+            self.extensions.setdefault(os.path.splitext(node.get_name())[1], {})[path] = node
+
+    def removed(self, child: IFileSystem):
+        for node in depth_first(child):
+            path = self.__path_of.pop(id(node))
+            del self.paths[path]
+            self.__discard(self.names, node.get_name(), path)
+            self.__discard(self.extensions, os.path.splitext(node.get_name())[1], path)
+
+    def glob(self, pattern: str) -> List[IFileSystem]:
+        return self.find(pattern)
+
+    def find(self, pattern: str = "**", min_size: int = None, max_size: int = None) -> List[IFileSystem]:
+        # Nodes whose path matches pattern and whose size is within
+        # [min_size, max_size]. "*" and "?" stay inside one path segment and
+        # "**" spans any number of them. Candidates come from the path, name
+        # or extension index, or a literal parent directory's children.
+        pattern = pattern.strip("/")
+        matcher = _compile(pattern)
+        candidates = self.__candidates(pattern)
+        return [
+            node
+            for path, node in candidates
+            if matcher(path)
+            and (min_size is None or node.get_size() >= min_size)
+            and (max_size is None or node.get_size() <= max_size)
+        ]
+
+    def __candidates(self, pattern: str) -> Iterable:
+        if not _WILDCARD.search(pattern):
+            node = self.paths.get(pattern)
+            return ((pattern, node),) if node is not None else ()
+        prefix, _, rest = pattern.rpartition("/")
+        if prefix and "**" not in pattern and not _WILDCARD.search(prefix):
+            # One wildcard segment under a literal directory: just its children
+            directory = self.paths.get(prefix)
+            if directory is None or not isinstance(directory, Directory):
+                return ()
+            return ((self.__join(prefix, child.get_name()), child) for child in directory)
+        last = rest
+        if not _WILDCARD.search(last):
+            return self.names.get(last, {}).items()
+        stem, extension = os.path.splitext(last)
+        if stem == "*" and extension and not _WILDCARD.search(extension):
+            return self.extensions.get(extension, {}).items()
+        return self.paths.items()
+
+    @staticmethod
+    def __discard(index: Dict[str, Dict[str, IFileSystem]], key: str, path: str):
+        bucket = index[key]
+        del bucket[path]
+        if not bucket:
+            del index[key]
+
+    @staticmethod
+    def __join(parent: str, name: str) -> str:
+        return f"{parent}/{name}" if parent else name
+
+
+_WILDCARD = re.compile(r"[*?]")
+_TOKENS = re.compile(r"\*\*/|\*\*|\*|\?|[^*?]+")
+
+
+def _compile(pattern: str):
+    parts = []
+    for token in _TOKENS.findall(pattern):
+        if token == "**/":
+            parts.append("(?:.*/)?")
+        elif token == "**":
+            parts.append(".*")
+        elif token == "*":
+            parts.append("[^/]*")
+        elif token == "?":
+            parts.append("[^/]")
+        else:
+            parts.append(re.escape(token))
+    return re.compile("".join(parts) + r"\Z", re.DOTALL).match
+
+
+if __name__ == "__main__":
+    import time
+
+    from app import File
+
+    root = Directory("Root")
+    index = PathIndex(root)
+    music = Directory("Music")
+    photos = Directory("Photos")
+    root.add_child(music)
+    root.add_child(photos)
+    music.add_child(File("song.mp3", 4096))
+    photos.add_child(File("beach.jpg", 2048))
+    photos.add_child(File("thumb.jpg", 64))
+    holiday = Directory("Holiday")
+    holiday.add_child(File("sunset.jpg", 8192))
+    photos.add_child(holiday)
+
+    print([index.path(node) for node in index.glob("**/*.jpg")])
+    print([index.path(node) for node in index.find("**/*.jpg", min_size=1000)])
+    print([index.path(node) for node in index.glob("Photos/*")])
+    print(index.get("Photos/Holiday/sunset.jpg").get_size())
+
+    # Moving a subtree re-keys every path under it
+    music.add_child(holiday)
+    print([index.path(node) for node in index.glob("**/sunset.jpg")])
+
+    # Thousands of lookups against a larger tree
+    for block in range(200):
+        directory = Directory(f"block-{block}")
+        for item in range(500):
+            directory.add_child(File(f"file-{item}.{('jpg', 'txt', 'csv')[item % 3]}", item))
+        root.add_child(directory)
+    started = time.perf_counter()
+    for block in range(1000):
+        index.find(f"block-{block % 200}/*.csv", min_size=250)
+    print(f"{len(index):,} paths, 1,000 queries in {time.perf_counter() - started:.3f}s")
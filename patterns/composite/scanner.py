@@ -0,0 +1,156 @@
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import os
+from typing import Iterator, List, Tuple, Union
+
+from app import IFileSystem
+
+
+class CompactTree:
+    # Array-backed file system tree: one slot per node in each column instead
+    # of one Python object per node. Node 0 is the root, and every node comes
+    # after its parent. Names live in one UTF-8 string table.
+    def __init__(self) -> None:
+        self.parent = array("q")
+        self.size = array("q")
+        self.is_directory = array("b")
+        self.first_child = array("q")
+        self.next_sibling = array("q")
+        self.name_offset = array("Q")
+        self.name_length = array("I")
+        self.names = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.parent, self.size, self.is_directory, self.first_child, self.next_sibling)
+        columns += (self.name_offset, self.name_length)
+        return sum(column.itemsize * len(column) for column in columns) + len(self.names)
+
+    @property
+    def root(self) -> "CompactDirectory":
+        return self.node(0)
+
+    def node(self, index: int) -> Union["CompactFile", "CompactDirectory"]:
+        return (CompactDirectory if self.is_directory[index] else CompactFile)(self, index)
+
+    def name(self, index: int) -> str:
+        offset = self.name_offset[index]
+        return bytes(self.names[offset : offset + self.name_length[index]]).decode("utf-8", "surrogateescape")
+
+    def children(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def append(self, parent: int, name: str, is_directory: bool, size: int) -> int:
+        index = len(self.parent)
+        encoded = name.encode("utf-8", "surrogateescape")
+        self.parent.append(parent)
+        self.size.append(size)
+        self.is_directory.append(is_directory)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.name_offset.append(len(self.names))
+        self.name_length.append(len(encoded))
+        self.names += encoded
+        if parent != -1:
+            self.next_sibling[index] = self.first_child[parent]
+            self.first_child[parent] = index
+        return index
+
+    def aggregate_sizes(self):
+        # Rolls file sizes up into directory totals; children always follow
+        # their parent, so one backwards pass covers the whole tree.
+        parent, size = self.parent, self.size
+        for index in range(len(parent) - 1, 0, -1):
+            size[parent[index]] += size[index]
+
+
+class CompactFile(IFileSystem):
+    # Lazy façade over one CompactTree node; created on access, not stored.
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: CompactTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.tree.name(self.index)
+
+    @property
+    def parent(self) -> "CompactDirectory":
+        parent = self.tree.parent[self.index]
+        return self.tree.node(parent) if parent != -1 else None
+
+    def get_name(self):
+        return self.name
+
+    def get_size(self):
+        return self.tree.size[self.index]
+
+
+class CompactDirectory(CompactFile):
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[IFileSystem]:
+        return (self.tree.node(child) for child in self.tree.children(self.index))
+
+
+def scan(path: str, workers: int = None) -> CompactTree:
+    # Walks a real directory tree with os.scandir, listing directories
+    # concurrently on a thread pool. Symlinks are recorded but not followed,
+    # and unreadable directories come out empty.
+    tree = CompactTree()
+    root = tree.append(-1, os.path.basename(os.path.abspath(path)) or path, True, 0)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_list_directory, path): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                parent = pending.pop(future)
+                for name, entry_path, is_directory, size in future.result():
+                    index = tree.append(parent, name, is_directory, size)
+                    if is_directory:
+                        pending[pool.submit(_list_directory, entry_path)] = index
+    tree.aggregate_sizes()
+    return tree
+
+
+def _list_directory(path: str) -> List[Tuple[str, str, bool, int]]:
+    entries = []
+    try:
+        with os.scandir(path) as listing:
+            for entry in listing:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        entries.append((entry.name, entry.path, True, 0))
+                    else:
+                        entries.append((entry.name, entry.path, False, entry.stat(follow_symlinks=False).st_size))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Scan a directory tree into a compact composite.")
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tree = scan(args.path, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"Scanned {len(tree):,} entries in {elapsed:.2f}s ({len(tree) / elapsed:,.0f} entries/s)")
+    print(f"Tree memory: {tree.nbytes / len(tree):.1f} bytes per entry")
+    for item in tree.root:
+        print(item.get_name(), item.get_size())
@@ -0,0 +1,173 @@
+from array import array
+import mmap
+import os
+import struct
+import sys
+from typing import Union
+
+from app import FileSystemException, IFileSystem
+from scanner import CompactTree
+
+# File layout, native byte order:
+#   header    magic, byte order, version, node count, name table length,
+#             padded to 32 bytes so the first column starts 8-byte aligned
+#   columns   one per COLUMNS entry, count items each, widest first so every
+#             following column stays aligned for memoryview.cast
+#   names     UTF-8 name table
+MAGIC = b"CTRE"
+HEADER = struct.Struct("=4sc3xIQQ4x")
+VERSION = 2
+COLUMNS = (
+    ("parent", "q"),
+    ("size", "q"),
+    ("first_child", "q"),
+    ("next_sibling", "q"),
+    ("name_offset", "Q"),
+    ("name_length", "I"),
+    ("is_directory", "b"),
+)
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+class MappedTree(CompactTree):
+    # A CompactTree whose columns are memoryviews over a memory-mapped
+    # snapshot. Opening only reads the header; pages are faulted in as nodes
+    # are touched, and façades are still only created on access. Read-only.
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise FileSystemException(f"{path} is not a composite snapshot.")
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            count, names = self.__check_header(path)
+        except FileSystemException:
+            self.__map.close()
+            raise
+        view = memoryview(self.__map)
+        offset = HEADER.size
+        for name, typecode in COLUMNS:
+            width = count * struct.calcsize(typecode)
+            setattr(self, name, view[offset : offset + width].cast(typecode))
+            offset += width
+        self.names = view[offset : offset + names]
+        self.__views = [getattr(self, name) for name, _ in COLUMNS] + [self.names, view]
+
+    def __check_header(self, path: str):
+        magic, byte_order, version, count, names = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            raise FileSystemException(f"{path} is not a composite snapshot.")
+        if byte_order != _BYTE_ORDER:
+            raise FileSystemException(f"{path} was written with the other byte order.")
+        expected = HEADER.size + sum(count * struct.calcsize(typecode) for _, typecode in COLUMNS) + names
+        if len(self.__map) < expected:
+            raise FileSystemException(f"{path} is truncated: {len(self.__map)} of {expected} bytes.")
+        return count, names
+
+    def append(self, parent: int, name: str, is_directory: bool, size: int) -> int:
+        raise FileSystemException("Snapshots are read-only.")
+
+    def close(self):
+        for view in self.__views:
+            view.release()
+        self.__map.close()
+
+    def __enter__(self) -> "MappedTree":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def to_compact(root: IFileSystem) -> CompactTree:
+    # Copies any composite (e.g. a Directory tree) into a CompactTree,
+    # keeping child order.
+    tree = CompactTree()
+    stack = [(root, -1)]
+    while stack:
+        node, parent = stack.pop()
+        is_directory = hasattr(node, "__iter__")
+        index = tree.append(parent, node.get_name(), is_directory, 0 if is_directory else node.get_size())
+        if is_directory:
+            # CompactTree.append links each child in front of its siblings,
+            # so children are appended last to first.
+            stack.extend((child, index) for child in node)
+    tree.aggregate_sizes()
+    return tree
+
+
+def save(source: Union[CompactTree, IFileSystem], path: str):
+    tree = source if isinstance(source, CompactTree) else to_compact(source)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, _BYTE_ORDER, VERSION, len(tree), len(tree.names)))
+        for name, typecode in COLUMNS:
+            column = getattr(tree, name)
+            if column.itemsize != struct.calcsize(typecode):
+                raise FileSystemException(f"Unexpected {name} column width.")
+            file.write(column)
+        file.write(tree.names)
+
+
+def load(path: str) -> MappedTree:
+    return MappedTree(path)
+
+
+def synthetic(nodes: int, fanout: int) -> CompactTree:
+    # Complete fanout-ary tree built column by column; node i's parent is
+    # (i - 1) // fanout and leaves are files.
+    tree = CompactTree()
+    tree.parent = array("q", range(-1, nodes - 1))
+    for index in range(1, nodes):
+        tree.parent[index] = (index - 1) // fanout
+    tree.first_child = array("q", (index * fanout + 1 if index * fanout + 1 < nodes else -1 for index in range(nodes)))
+    tree.next_sibling = array("q", (index + 1 if index % fanout and index + 1 < nodes else -1 for index in range(nodes)))
+    tree.is_directory = array("b", (child != -1 for child in tree.first_child))
+    tree.size = array("q", (0 if directory else index % 4096 for index, directory in enumerate(tree.is_directory)))
+    names = [f"{'dir' if directory else 'file'}{index}".encode() for index, directory in enumerate(tree.is_directory)]
+    tree.name_length = array("I", map(len, names))
+    tree.name_offset = array("Q", [0]) * nodes
+    offset = 0
+    for index, length in enumerate(tree.name_length):
+        tree.name_offset[index] = offset
+        offset += length
+    tree.names = bytearray(b"".join(names))
+    tree.aggregate_sizes()
+    return tree
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import random
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Cold start of a memory-mapped composite snapshot.")
+    parser.add_argument("--nodes", type=int, default=10_000_000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "composite.snapshot"))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tree = synthetic(args.nodes, args.fanout)
+    print(f"Built {len(tree):,} nodes in {time.perf_counter() - started:.1f}s")
+    started = time.perf_counter()
+    save(tree, args.path)
+    print(f"Saved {os.path.getsize(args.path) / 2**20:,.1f}MB in {time.perf_counter() - started:.2f}s")
+    expected = tree.root.get_size()
+    del tree
+
+    started = time.perf_counter()
+    with load(args.path) as snapshot:
+        root = snapshot.root
+        opened = time.perf_counter() - started
+        children = [(child.get_name(), child.get_size()) for child in root]
+        node = snapshot.node(random.randrange(len(snapshot)))
+        trail = []
+        while node is not None:
+            trail.append(node.get_name())
+            node = node.parent
+        touched = time.perf_counter() - started
+        assert root.get_size() == expected
+        print(f"Opened in {opened * 1000:.2f}ms; root, {len(children)} children and a random path in {touched * 1000:.2f}ms")
+        print("/".join(reversed(trail)))
+    os.remove(args.path)
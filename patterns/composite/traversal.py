@@ -0,0 +1,106 @@
+from collections import deque
+from collections.abc import Iterable
+from enum import Enum
+from typing import Callable, Iterator
+
+from app import IFileSystem
+
+Predicate = Callable[[IFileSystem], bool]
+
+_DONE = object()
+
+
+class Order(Enum):
+    PRE = "pre"
+    POST = "post"
+
+
+# Iterative walks over any composite whose directories are iterable (Directory,
+# CompactDirectory, ...). They keep their own stack instead of recursing, so
+# tree depth is bounded by memory, not the recursion limit.
+#
+# prune: called on every node below the root; True skips the node and its subtree.
+# max_depth: deepest level yielded, the root being level 0; None for no limit.
+
+
+def depth_first(
+    root: IFileSystem,
+    order: Order = Order.PRE,
+    prune: Predicate = None,
+    max_depth: int = None,
+) -> Iterator[IFileSystem]:
+    # One child iterator per open directory is the only state kept, so memory
+    # grows with depth and nothing is allocated per file.
+    limit = -1 if max_depth is None else max_depth
+    if order is Order.PRE:
+        yield root
+    parents = [root]
+    iterators = [iter(root) if limit and isinstance(root, Iterable) else iter(())]
+    while iterators:
+        child = next(iterators[-1], _DONE)
+        if child is _DONE:
+            iterators.pop()
+            if order is Order.POST:
+                yield parents[-1]
+            parents.pop()
+            continue
+        if prune is not None and prune(child):
+            continue
+        if len(iterators) != limit and isinstance(child, Iterable):
+            if order is Order.PRE:
+                yield child
+            parents.append(child)
+            iterators.append(iter(child))
+        else:
+            yield child
+
+
+def breadth_first(root: IFileSystem, prune: Predicate = None, max_depth: int = None) -> Iterator[IFileSystem]:
+    # Level by level; only the directories of the next level are queued.
+    yield root
+    if not isinstance(root, Iterable):
+        return
+    queue = deque((root,))
+    depth, remaining = 0, 1
+    while queue and depth != max_depth:
+        directory = queue.popleft()
+        for child in directory:
+            if prune is not None and prune(child):
+                continue
+            yield child
+            if isinstance(child, Iterable):
+                queue.append(child)
+        remaining -= 1
+        if not remaining:
+            depth, remaining = depth + 1, len(queue)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from app import Directory, File
+
+    # A chain far deeper than the recursion limit, built bottom up so each
+    # add_child is O(1).
+    depth = 200_000
+    node = Directory(f"level-{depth}")
+    node.add_child(File("leaf.txt", 1))
+    for level in range(depth - 1, -1, -1):
+        parent = Directory(f"level-{level}")
+        parent.add_child(node)
+        node = parent
+    print(f"Recursion limit {sys.getrecursionlimit()}, tree depth {depth}")
+
+    for name, walk in (
+        ("pre-order", lambda: depth_first(node)),
+        ("post-order", lambda: depth_first(node, Order.POST)),
+        ("breadth-first", lambda: breadth_first(node)),
+    ):
+        started = time.perf_counter()
+        visited = sum(1 for _ in walk())
+        print(f"{name:<14} {visited:,} nodes in {time.perf_counter() - started:.3f}s")
+
+    print([item.get_name() for item in depth_first(node, max_depth=2)])
+    print([item.get_name() for item in depth_first(node, Order.POST, max_depth=2)])
+    print(sum(1 for _ in breadth_first(node, prune=lambda item: item.get_name() == "level-10")))
@@ -0,0 +1,38 @@
+import argparse
+import os
+import resource
+import time
+
+from main import _LINE_ITEMS, DarkRoast, Decaf, Espresso, HouseBlend, Mocha, SteamMilk, Soy, Whip
+
+
+def rss_megabytes() -> float:
+    # Current resident set size, falling back to the peak where /proc is missing.
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RSS while creating and describing many drinks.")
+    parser.add_argument("--drinks", type=int, default=10_000_000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--discounts", type=int, default=10_000, help="distinct discount values cycled through")
+    args = parser.parse_args()
+
+    bases = (Espresso, HouseBlend, DarkRoast, Decaf)
+    condiments = (SteamMilk, Mocha, Soy, Whip)
+    step = max(args.drinks // args.samples, 1)
+    started = time.perf_counter()
+    print(f"{'Drinks':>12}  {'RSS (MB)':>9}  {'Line items':>10}")
+    print(f"{0:>12}  {rss_megabytes():>9.1f}  {len(_LINE_ITEMS):>10}")
+    for created in range(1, args.drinks + 1):
+        drink = condiments[created % 4](condiments[created // 4 % 4](bases[created % 4]()))
+        if created % 2:
+            drink.discount = created % args.discounts / args.discounts
+        drink.description
+        if created % step == 0:
+            print(f"{created:>12,}  {rss_megabytes():>9.1f}  {len(_LINE_ITEMS):>10}")
+    print(f"Created {args.drinks:,} drinks in {time.perf_counter() - started:.1f}s")
@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+from weakref import WeakKeyDictionary
+
+
+# Undiscounted receipt lines are interned: every order of the same item
+# shares a single tuple. Discounted lines are not, so the table stays one
+# entry per menu item however many discount values are used.
+_LINE_ITEMS: Dict[Tuple[str, float], Tuple[str, float]] = {}
 
 
 class IBeverage(ABC):
-    __description__: str = []
-    __discount__: int = 0.0
+    __slots__ = ("__discount__", "__views__")
+    __label__: str = ""
+    __price__: float = 0.0
 
     @abstractmethod
     def price(self) -> float:
@@ -12,7 +20,7 @@ class IBeverage(ABC):
     
     @property
     @abstractmethod
-    def description(self) -> List[Tuple[str, int]]:
+    def description(self) -> Tuple[Tuple[str, float], ...]:
         pass
 
     @property
@@ -20,15 +28,41 @@ class IBeverage(ABC):
     def discount(self) -> float:
         pass
 
+    def line_item(self) -> Tuple[str, float]:
+        # This layer's own receipt line, without the beverage it wraps.
+        if self.__discount__:
+            return (self.__label__, self.__price__ * (1 - self.__discount__))
+        line_item = (self.__label__, float(self.__price__))
+        return _LINE_ITEMS.setdefault(line_item, line_item)
+
+    def layers(self) -> List["IBeverage"]:
+        # The wrapper chain from the base beverage outwards, walked iteratively.
+        layers = []
+        beverage = self
+        while beverage is not None:
+            layers.append(beverage)
+            beverage = getattr(beverage, "beverage", None)
+        layers.reverse()
+        return layers
+
+    def compile(self) -> "CompiledBeverage":
+        return CompiledBeverage(self)
+
+    def _discount_changed(self) -> None:
+        for view, index in list(getattr(self, "__views__", {}).items()):
+            view.invalidate(index)
+
 class Espresso(IBeverage):
+    __slots__ = ()
+    __label__ = "Espresso"
+    __price__ = 20
+
     def __init__(self) -> None:
         self.__discount__ = 0.0
-        self.__price__ = 20
-        self.__description__.append(["Espresso", self.__price__ * (1 - self.__discount__)])
         
     @property
-    def description(self) -> List[Tuple[str, int]]:
-        return self.__description__
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return (self.line_item(),)
 
     @property
     def discount(self) -> float:
@@ -37,19 +71,22 @@ class Espresso(IBeverage):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.__price__ * (1 - self.__discount__)
 
 class HouseBlend(IBeverage):
+    __slots__ = ()
+    __label__ = "House Blend"
+    __price__ = 18
+
     def __init__(self) -> None:
         self.__discount__ = 0.0
-        self.__price__ = 18
-        self.__description__.append(["House Blend", self.__price__ * (1 - self.__discount__)])
         
     @property
-    def description(self) -> List[Tuple[str, int]]:
-        return self.__description__
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return (self.line_item(),)
 
     @property
     def discount(self) -> float:
@@ -58,20 +95,23 @@ class HouseBlend(IBeverage):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.__price__ * (1 - self.__discount__)
     
     
 class DarkRoast(IBeverage):
+    __slots__ = ()
+    __label__ = "Dark Roast"
+    __price__ = 19
+
     def __init__(self) -> None:
         self.__discount__ = 0.0
-        self.__price__ = 19
-        self.__description__.append(["Dark Roast", self.__price__ * (1 - self.__discount__)])
         
     @property
-    def description(self) -> List[Tuple[str, int]]:
-        return self.__description__
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return (self.line_item(),)
 
     @property
     def discount(self) -> float:
@@ -80,19 +120,22 @@ class DarkRoast(IBeverage):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.__price__ * (1 - self.__discount__)
     
 class Decaf(IBeverage):
+    __slots__ = ()
+    __label__ = "Decaf"
+    __price__ = 20
+
     def __init__(self) -> None:
         self.__discount__ = 0.0
-        self.__price__ = 20
-        self.__description__.append(["Decaf", self.__price__ * (1 - self.__discount__)])
         
     @property
-    def description(self) -> List[Tuple[str, int]]:
-        return self.__description__
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return (self.line_item(),)
 
     @property
     def discount(self) -> float:
@@ -101,23 +144,27 @@ class Decaf(IBeverage):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.__price__ * (1 - self.__discount__)
     
 
 class ICondiment(IBeverage):
-    pass
+    __slots__ = ("beverage",)
 
 class SteamMilk(ICondiment):
+    __slots__ = ()
+    __label__ = "Steamed Milk"
+    __price__ = 5
+
     def __init__(self, beverage: IBeverage) -> None:
         self.beverage = beverage
         self.__discount__ = 0.0
-        self.__price__ = 5
         
     @property
-    def description(self) -> str:
-        return self.beverage.description + [["Steamed Milk", self.__price__ * (1 - self.__discount__)]]
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return tuple(layer.line_item() for layer in self.layers())
 
     @property
     def discount(self) -> float:
@@ -126,19 +173,23 @@ class SteamMilk(ICondiment):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.beverage.price() + (self.__price__ * (1 - self.__discount__))
     
 class Mocha(ICondiment):
+    __slots__ = ()
+    __label__ = "Mocha"
+    __price__ = 10
+
     def __init__(self, beverage: IBeverage) -> None:
         self.beverage = beverage
         self.__discount__ = 0.0
-        self.__price__ = 10
         
     @property
-    def description(self) -> str:
-        return self.beverage.description + [["Mocha", self.__price__ * (1 - self.__discount__)]]
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return tuple(layer.line_item() for layer in self.layers())
 
     @property
     def discount(self) -> float:
@@ -147,19 +198,23 @@ class Mocha(ICondiment):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.beverage.price() + (self.__price__ * (1 - self.__discount__))
     
 class Soy(ICondiment):
+    __slots__ = ()
+    __label__ = "Soy"
+    __price__ = 7.5
+
     def __init__(self, beverage: IBeverage) -> None:
         self.beverage = beverage
         self.__discount__ = 0.0
-        self.__price__ = 7.5
         
     @property
-    def description(self) -> str:
-        return self.beverage.description + [["Soy", self.__price__ * (1 - self.__discount__)]]
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return tuple(layer.line_item() for layer in self.layers())
 
     @property
     def discount(self) -> float:
@@ -168,19 +223,23 @@ class Soy(ICondiment):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.beverage.price() + (self.__price__ * (1 - self.__discount__))
     
 class Whip(ICondiment):
+    __slots__ = ()
+    __label__ = "Whipped"
+    __price__ = 5
+
     def __init__(self, beverage: IBeverage) -> None:
         self.beverage = beverage
         self.__discount__ = 0.0
-        self.__price__ = 5
         
     @property
-    def description(self) -> str:
-        return self.beverage.description + [["Whipped", self.__price__ * (1 - self.__discount__)]]
+    def description(self) -> Tuple[Tuple[str, float], ...]:
+        return tuple(layer.line_item() for layer in self.layers())
 
     @property
     def discount(self) -> float:
@@ -189,13 +248,59 @@ class Whip(ICondiment):
     @discount.setter
     def discount(self, value: float) -> None:
         self.__discount__ = float(value)
+        self._discount_changed()
 
     def price(self) -> float:
         return self.beverage.price() + (self.__price__ * (1 - self.__discount__))
 
-print("===================== Here is Your Receipt =====================") 
-drink = Whip(Espresso())
-drink.discount = 0.5
-max_price = max([len(str(price)) for _, price in drink.description])
-max_desc = max([len(desc) for desc, _ in drink.description])
-print(f"{"\n".join([f"{description:{max_desc}}  {price}" for description, price in drink.description])}\n{" ":{max_desc}}  {"-"*max_price}\n{"Total":{max_desc}}  {drink.price()}")
+def render_receipt(line_items: Tuple[Tuple[str, float], ...], total: float) -> str:
+    max_price = max(len(str(price)) for _, price in line_items)
+    max_desc = max(len(description) for description, _ in line_items)
+    lines = [f"{description:{max_desc}}  {price}" for description, price in line_items]
+    lines.append(f"{' ':{max_desc}}  {'-' * max_price}")
+    lines.append(f"{'Total':{max_desc}}  {total}")
+    return "\n".join(lines)
+
+
+class CompiledBeverage:
+    # Flat, immutable view of a decorated beverage. The wrapper chain is walked
+    # once; line items, total and receipt are cached afterwards. Changing one
+    # layer's discount only re-prices that layer's line.
+    def __init__(self, beverage: IBeverage) -> None:
+        self.__layers: Tuple[IBeverage, ...] = tuple(beverage.layers())
+        self.__lines: List[Tuple[str, float]] = [layer.line_item() for layer in self.__layers]
+        self.__total = sum(price for _, price in self.__lines)
+        self.__line_items: Tuple[Tuple[str, float], ...] = None
+        self.__receipt: str = None
+        for index, layer in enumerate(self.__layers):
+            if getattr(layer, "__views__", None) is None:
+                layer.__views__ = WeakKeyDictionary()
+            layer.__views__[self] = index
+
+    @property
+    def line_items(self) -> Tuple[Tuple[str, float], ...]:
+        if self.__line_items is None:
+            self.__line_items = tuple(self.__lines)
+        return self.__line_items
+
+    def price(self) -> float:
+        return self.__total
+
+    def receipt(self) -> str:
+        if self.__receipt is None:
+            self.__receipt = render_receipt(self.line_items, self.__total)
+        return self.__receipt
+
+    def invalidate(self, index: int) -> None:
+        _, old_price = self.__lines[index]
+        self.__lines[index] = self.__layers[index].line_item()
+        self.__total += self.__lines[index][1] - old_price
+        self.__line_items = None
+        self.__receipt = None
+
+
+if __name__ == "__main__":
+    print("===================== Here is Your Receipt =====================") 
+    drink = Whip(Espresso())
+    drink.discount = 0.5
+    print(drink.compile().receipt())
@@ -0,0 +1,120 @@
+from array import array
+from itertools import repeat
+from operator import add, mul, sub
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple, Type, Union
+
+from main import (
+    DarkRoast,
+    Decaf,
+    Espresso,
+    HouseBlend,
+    IBeverage,
+    ICondiment,
+    Mocha,
+    SteamMilk,
+    Soy,
+    Whip,
+    render_receipt,
+)
+
+MenuItem = Union[str, Type[IBeverage]]
+
+
+class Order(NamedTuple):
+    base: MenuItem
+    condiments: Mapping[MenuItem, int]
+    discount: float = 0.0
+
+
+class OrderBatch:
+    # Orders encoded column by column against a MenuTable: one base index
+    # column, one count column per condiment and a discount column. Encode
+    # once, then price the same batch as often as needed (e.g. promo runs).
+    def __init__(self, bases: array, counts: List[array], discounts: array) -> None:
+        self.bases = bases
+        self.counts = counts
+        self.discounts = discounts
+
+    def __len__(self) -> int:
+        return len(self.bases)
+
+
+class MenuTable:
+    # Price table built from the beverage and condiment classes themselves, so
+    # bulk pricing matches what the decorator chain would charge.
+    def __init__(
+        self,
+        bases: Sequence[Type[IBeverage]] = (Espresso, HouseBlend, DarkRoast, Decaf),
+        condiments: Sequence[Type[ICondiment]] = (SteamMilk, Mocha, Soy, Whip),
+    ) -> None:
+        self.base_labels: Tuple[str, ...] = tuple(base.__label__ for base in bases)
+        self.condiment_labels: Tuple[str, ...] = tuple(condiment.__label__ for condiment in condiments)
+        self.base_prices = array("d", (base().__price__ for base in bases))
+        self.condiment_prices = array("d", (condiment(bases[0]()).__price__ for condiment in condiments))
+        self.__bases: Dict[MenuItem, int] = {}
+        for index, base in enumerate(bases):
+            self.__bases[base] = self.__bases[base.__label__] = index
+        self.__condiments: Dict[MenuItem, int] = {}
+        for index, condiment in enumerate(condiments):
+            self.__condiments[condiment] = self.__condiments[condiment.__label__] = index
+
+    def encode(self, orders: Iterable[Order]) -> OrderBatch:
+        orders = list(orders)
+        bases = array("H", (self.__bases[base] for base, _, _ in orders))
+        discounts = array("d", (float(discount) for _, _, discount in orders))
+        counts = [array("H", bytes(2 * len(orders))) for _ in self.condiment_labels]
+        for row, (_, condiments, _) in enumerate(orders):
+            for condiment, count in condiments.items():
+                counts[self.__condiments[condiment]][row] = count
+        return OrderBatch(bases, counts, discounts)
+
+    def price(self, orders: Union[OrderBatch, Iterable[Order]]) -> array:
+        # Totals for every order, one column pass per menu column.
+        batch = orders if isinstance(orders, OrderBatch) else self.encode(orders)
+        totals = map(self.base_prices.__getitem__, batch.bases)
+        for price, counts in zip(self.condiment_prices, batch.counts):
+            totals = map(add, totals, map(mul, counts, repeat(price)))
+        return array("d", map(mul, totals, map(sub, repeat(1.0), batch.discounts)))
+
+    def receipts(self, orders: Union[OrderBatch, Iterable[Order]]) -> List[str]:
+        # Receipts in order; identical orders share one rendered receipt.
+        batch = orders if isinstance(orders, OrderBatch) else self.encode(orders)
+        rendered: Dict[tuple, str] = {}
+        receipts = []
+        for key in zip(batch.bases, batch.discounts, *batch.counts):
+            receipt = rendered.get(key)
+            if receipt is None:
+                receipt = rendered[key] = self.__receipt(*key)
+            receipts.append(receipt)
+        return receipts
+
+    def __receipt(self, base: int, discount: float, *counts: int) -> str:
+        factor = 1 - discount
+        line_items = [(self.base_labels[base], self.base_prices[base] * factor)]
+        for label, price, count in zip(self.condiment_labels, self.condiment_prices, counts):
+            line_items.extend(repeat((label, price * factor), count))
+        return render_receipt(tuple(line_items), sum(price for _, price in line_items))
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    menu = MenuTable()
+    generator = random.Random(7)
+    orders = [
+        Order(
+            generator.choice(menu.base_labels),
+            {label: generator.randint(0, 2) for label in generator.sample(menu.condiment_labels, 2)},
+            generator.choice((0.0, 0.1, 0.5)),
+        )
+        for _ in range(1_000_000)
+    ]
+    started = time.perf_counter()
+    batch = menu.encode(orders)
+    encoded = time.perf_counter()
+    totals = menu.price(batch)
+    priced = time.perf_counter()
+    print(f"Encoded {len(batch)} orders in {encoded - started:.2f}s, priced in {priced - encoded:.2f}s")
+    print(f"Revenue: {sum(totals):,.2f}")
+    print(menu.receipts(orders[:1])[0])
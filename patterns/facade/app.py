@@ -1,69 +1,204 @@
-from typing import List
+from itertools import count
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from render import Renderer, RowChange
+
+class GUIException(Exception):
+    """ Raised for unknown windows, components or events """
+    pass
 
 class IComponent:
     """ Interface for GUI components """
-    pass
+
+    # Events the component handles, mapped to the method that handles them
+    __events__: Dict[str, str] = {}
+
+    window: "Window" = None
+    component_id: str = None
+
+    def render(self) -> str:
+        return ""
+
+    def invalidate(self):
+        """ Marks the component for redraw on the next frame """
+        if self.window is not None:
+            self.window.mark_dirty(self.component_id)
 
 class Window(IComponent):
     """ Represents a window in the GUI """
 
-    __components: List[IComponent] = []
-
     def __init__(self, title: str):
         self.title = title
+        self.visible = False
+        self.__components: Dict[str, IComponent] = {}
+        self.__routes: Dict[str, Dict[str, Callable]] = {}
+        self.__ids = count(1)
+        self.__dirty: Dict[str, None] = {}
+        self.__relayout = True
 
     @property
     def components(self) -> List[IComponent]:
-        return self.__components
-
-    def add_component(self, component: IComponent):
-        self.__components.append(component)
+        return list(self.__components.values())
+
+    def items(self) -> Iterator[Tuple[str, IComponent]]:
+        return iter(self.__components.items())
+
+    def add_component(self, component: IComponent, component_id: str = None) -> str:
+        """ Registers the component and its event handlers; returns its id """
+        if component_id is None:
+            component_id = f"{type(component).__name__.lower()}-{next(self.__ids)}"
+        if component.window is not None:
+            raise GUIException(
+                f"Component '{component.component_id}' already belongs to window '{component.window.title}'"
+            )
+        if component_id in self.__components:
+            raise GUIException(f"Window '{self.title}' already has a component '{component_id}'")
+        self.__components[component_id] = component
+        self.__routes[component_id] = {
+            event: getattr(component, method) for event, method in type(component).__events__.items()
+        }
+        component.window, component.component_id = self, component_id
+        self.__relayout = True
+        return component_id
+
+    def remove_component(self, component_id: str) -> IComponent:
+        self.__routes.pop(component_id, None)
+        self.__dirty.pop(component_id, None)
+        try:
+            component = self.__components.pop(component_id)
+        except KeyError:
+            raise GUIException(f"Window '{self.title}' has no component '{component_id}'") from None
+        component.window = component.component_id = None
+        self.__relayout = True
+        return component
+
+    def get_component(self, component_id: str) -> IComponent:
+        try:
+            return self.__components[component_id]
+        except KeyError:
+            raise GUIException(f"Window '{self.title}' has no component '{component_id}'") from None
+
+    def dispatch(self, component_id: str, event: str, *args):
+        """ Routes an event to the handler registered for it """
+        try:
+            handler = self.__routes[component_id][event]
+        except KeyError:
+            raise GUIException(f"No '{event}' handler for '{component_id}' in window '{self.title}'") from None
+        return handler(*args)
+
+    def mark_dirty(self, component_id: str):
+        self.__dirty[component_id] = None
+
+    def collect_changes(self) -> Tuple[bool, List[str]]:
+        """ Returns whether the layout changed and which components are dirty, then resets both """
+        relayout, dirty = self.__relayout, list(self.__dirty)
+        self.__relayout = False
+        self.__dirty.clear()
+        return relayout, dirty
+
+    def render(self) -> str:
+        return f"== {self.title} =="
 
     def show(self):
-        print(f"Showing window: {self.title}")
+        self.visible = True
+        self.__relayout = True
+        self.__dirty.clear()
 
     def hide(self):
-        print(f"Hiding window: {self.title}")
+        self.visible = False
+        self.__relayout = True
+        self.__dirty.clear()
 
 
 class Button(IComponent):
     """ Represents a button in the GUI """
 
+    __events__ = {"click": "click"}
+
     def __init__(self, text: str):
         self.text = text
+        self.clicks = 0
 
     def click(self):
-        print(f"Button '{self.text}' clicked")
+        self.clicks += 1
+        self.invalidate()
+
+    def render(self) -> str:
+        return f"[ {self.text} ] clicked {self.clicks}x" if self.clicks else f"[ {self.text} ]"
 
 
 class Label(IComponent):
     """ Represents a label in the GUI """
 
+    __events__ = {"set_text": "set_text"}
+
     def __init__(self, text: str):
         self.text = text
 
     def set_text(self, text: str):
-        self.text = text
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+
+    def render(self) -> str:
+        return self.text
 
 
 class GUIFacade:
     """ Facade for creating and managing the user interface """
 
     def __init__(self):
-        self.window = Window("My Application")
+        self.windows: Dict[str, Window] = {}
+        self.renderers: Dict[str, Renderer] = {}
+        self.window = self.open_window("My Application")
         self.button = Button("Click Me")
         self.label = Label("Hello, World!")
 
+    def open_window(self, title: str) -> Window:
+        if title in self.windows:
+            raise GUIException(f"Window '{title}' is already open")
+        window = self.windows[title] = Window(title)
+        self.renderers[title] = Renderer(window)
+        return window
+
     def create_ui(self):
         self.window.show()
-        self.window.add_component(self.button)
-        self.window.add_component(self.label)
-
-    def handle_button_click(self):
-        self.button.click()
-
-
-# Usage:
-gui_facade = GUIFacade()
-gui_facade.create_ui()
-gui_facade.handle_button_click()
\ No newline at end of file
+        self.window.add_component(self.button, "button")
+        self.window.add_component(self.label, "label")
+
+    def dispatch(self, title: str, component_id: str, event: str, *args):
+        """ Routes an event to a component of any open window by id """
+        try:
+            window = self.windows[title]
+        except KeyError:
+            raise GUIException(f"No window '{title}'") from None
+        return window.dispatch(component_id, event, *args)
+
+    def render(self) -> Dict[str, List[RowChange]]:
+        """ Renders every window and returns the changed rows of those that changed """
+        frames = {title: renderer.render() for title, renderer in self.renderers.items()}
+        return {title: changes for title, changes in frames.items() if changes}
+
+    def handle_button_click(self, component_id: str = "button", title: str = None):
+        self.dispatch(title or self.window.title, component_id, "click")
+
+    def update_label(self, text: str, component_id: str = "label", title: str = None):
+        self.dispatch(title or self.window.title, component_id, "set_text", text)
+
+
+if __name__ == "__main__":
+    # Usage:
+    gui_facade = GUIFacade()
+    gui_facade.create_ui()
+    print(gui_facade.render())
+    gui_facade.handle_button_click()
+    gui_facade.update_label("Goodbye, World!")
+    print(gui_facade.render())
+    print(gui_facade.renderers["My Application"].buffer)
+
+    # Events reach components of any window by id
+    settings = gui_facade.open_window("Settings")
+    save_id = settings.add_component(Button("Save"))
+    settings.show()
+    gui_facade.dispatch("Settings", save_id, "click")
+    print(gui_facade.render())
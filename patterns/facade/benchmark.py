@@ -0,0 +1,40 @@
+import argparse
+import random
+import time
+
+from app import Button, GUIFacade, Label
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame time against component count.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--changes", type=int, default=10, help="labels updated between incremental frames")
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'Components':>10}  {'Full frame (ms)':>15}  {'Incremental (ms)':>16}")
+    for size in args.sizes:
+        gui = GUIFacade()
+        window = gui.windows["My Application"]
+        window.show()
+        labels = []
+        for index in range(size):
+            if index % 2:
+                labels.append(window.add_component(Label(f"Label {index}")))
+            else:
+                window.add_component(Button(f"Button {index}"))
+        renderer = gui.renderers["My Application"]
+
+        started = time.perf_counter()
+        for _ in range(args.frames):
+            window.show()  # forces a relayout, i.e. a full redraw
+            renderer.render()
+        full = (time.perf_counter() - started) / args.frames
+
+        started = time.perf_counter()
+        for frame in range(args.frames):
+            for component_id in random.sample(labels, min(args.changes, len(labels))):
+                gui.update_label(f"Frame {frame}", component_id)
+            renderer.render()
+        incremental = (time.perf_counter() - started) / args.frames
+        print(f"{size:>10,}  {full * 1000:>15.3f}  {incremental * 1000:>16.3f}")
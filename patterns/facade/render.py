@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from app import Window
+
+
+class RowChange(NamedTuple):
+    """ One frame buffer row that changed; text is None when the row went away """
+
+    row: int
+    text: Optional[str]
+
+
+class FrameBuffer:
+    """ In-memory frame: one text row per rendered item """
+
+    def __init__(self):
+        self.rows: List[str] = []
+
+    def write(self, row: int, text: str) -> Optional[RowChange]:
+        if row == len(self.rows):
+            self.rows.append(text)
+        elif self.rows[row] == text:
+            return None
+        else:
+            self.rows[row] = text
+        return RowChange(row, text)
+
+    def truncate(self, length: int) -> List[RowChange]:
+        removed = [RowChange(row, None) for row in range(length, len(self.rows))]
+        del self.rows[length:]
+        return removed
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows)
+
+
+class Renderer:
+    """ Headless renderer for one window: redraws only dirty components """
+
+    def __init__(self, window: "Window"):
+        self.window = window
+        self.buffer = FrameBuffer()
+        self.__rows: Dict[str, int] = {}
+
+    def render(self) -> List[RowChange]:
+        """ Brings the frame buffer up to date and returns the rows that changed """
+        relayout, dirty = self.window.collect_changes()
+        if relayout:
+            return self.__render_all()
+        if not self.window.visible:
+            return []
+        changes = []
+        for component_id in dirty:
+            component = self.window.get_component(component_id)
+            change = self.buffer.write(self.__rows[component_id], component.render())
+            if change is not None:
+                changes.append(change)
+        return changes
+
+    def __render_all(self) -> List[RowChange]:
+        self.__rows = {}
+        if not self.window.visible:
+            return self.buffer.truncate(0)
+        changes = [self.buffer.write(0, self.window.render())]
+        for row, (component_id, component) in enumerate(self.window.items(), 1):
+            self.__rows[component_id] = row
+            changes.append(self.buffer.write(row, component.render()))
+        changes = [change for change in changes if change is not None]
+        return changes + self.buffer.truncate(len(self.__rows) + 1)
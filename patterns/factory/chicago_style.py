@@ -0,0 +1,36 @@
+from pizzas import (
+    ChicagoStylePizzas,
+    Pizza,
+    PizzaIngredientFactory,
+    register_ingredients,
+    register_pizza,
+)
+
+
+@register_pizza(ChicagoStylePizzas.CHEESEPIZZA)
+class ChicagoStyleCheesePizza(Pizza):
+    __slots__ = ()
+    name = "Chicago Style Cheese Pizza"
+
+
+@register_pizza(ChicagoStylePizzas.PEPPERONIPIZZA)
+class ChicagoStylePepperoniPizza(Pizza):
+    __slots__ = ()
+    name = "Chicago Style Pepperoni Pizza"
+
+
+@register_ingredients(ChicagoStylePizzas)
+class ChicagoIngredientStyleFactory(PizzaIngredientFactory):
+    TOPPINGS = {
+        ChicagoStylePizzas.CHEESEPIZZA: ("Cheese", "Ranch"),
+        ChicagoStylePizzas.PEPPERONIPIZZA: ("Cheese", "Pepperoni", "Ranch"),
+    }
+
+    def create_dough(self):
+        return "Thick"
+
+    def create_sauce(self):
+        return "BBQ"
+
+    def create_toppings(self):
+        return self.TOPPINGS.get(self.pizza, ())
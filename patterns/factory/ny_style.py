@@ -0,0 +1,36 @@
+from pizzas import (
+    NYStylePizzas,
+    Pizza,
+    PizzaIngredientFactory,
+    register_ingredients,
+    register_pizza,
+)
+
+
+@register_pizza(NYStylePizzas.CHEESEPIZZA)
+class NYStyleCheesePizza(Pizza):
+    __slots__ = ()
+    name = "New York Style Cheese Pizza"
+
+
+@register_pizza(NYStylePizzas.PEPPERONIPIZZA)
+class NYStylePepperoniPizza(Pizza):
+    __slots__ = ()
+    name = "New York Style Pepperoni Pizza"
+
+
+@register_ingredients(NYStylePizzas)
+class NYStyleIngredientFactory(PizzaIngredientFactory):
+    TOPPINGS = {
+        NYStylePizzas.CHEESEPIZZA: ("Cheese",),
+        NYStylePizzas.PEPPERONIPIZZA: ("Cheese", "Pepperoni", "Garlic"),
+    }
+
+    def create_dough(self):
+        return "Thin"
+
+    def create_sauce(self):
+        return "Marinara"
+
+    def create_toppings(self):
+        return self.TOPPINGS.get(self.pizza, ())
@@ -0,0 +1,147 @@
+from queue import Queue
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+if TYPE_CHECKING:
+    from pizzas import Pizza, Pizzas, PizzaStore
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.started: float = None
+        self.finished: float = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        # Pizzas per second through this stage.
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        # Share of the stage's worker time spent working rather than waiting.
+        return self.busy / (self.elapsed * self.workers) if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<8} workers={self.workers:<3} processed={self.processed:<6} failed={self.failed:<4} "
+            f"throughput={self.throughput:8.1f}/s utilisation={self.utilisation:6.1%} max queue={self.max_depth}"
+        )
+
+
+class PizzaPipeline:
+    # Runs orders through prepare -> bake -> cut -> box as a staged pipeline.
+    # Each stage has its own worker threads and a bounded queue in front of it,
+    # so a long bake only backs up its own queue while the other stages keep
+    # working on whatever they have.
+    #
+    # workers: worker threads per stage, 1 by default.
+    # delays: extra seconds spent per pizza in a stage, to model e.g. oven time.
+    # Steps run quietly; report() summarises each stage instead.
+    STAGES = ("prepare", "bake", "cut", "box")
+
+    def __init__(
+        self,
+        store: "PizzaStore",
+        workers: Dict[str, int] = None,
+        queue_size: int = 16,
+        delays: Dict[str, float] = None,
+    ) -> None:
+        self.store = store
+        self.queue_size = queue_size
+        self.delays = delays or {}
+        self.workers = {stage: (workers or {}).get(stage, 1) for stage in self.STAGES}
+        self.stats: Dict[str, StageStats] = {}
+        self.__queues: Dict[str, Queue] = {}
+        self.__remaining: Dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def depths(self) -> Dict[str, int]:
+        # Orders currently waiting in front of each stage.
+        return {stage: queue.qsize() for stage, queue in self.__queues.items()}
+
+    def run(self, orders: Iterable["Pizzas"]) -> List["Pizza"]:
+        # Returns the boxed pizzas in the order they came off the line.
+        self.stats = {stage: StageStats(stage, self.workers[stage]) for stage in self.STAGES}
+        self.__queues = {stage: Queue(maxsize=self.queue_size) for stage in self.STAGES}
+        self.__remaining = dict(self.workers)
+        boxed: List["Pizza"] = []
+        threads = [
+            threading.Thread(target=self.__work, args=(index, boxed), name=f"{stage}-{worker}", daemon=True)
+            for index, stage in enumerate(self.STAGES)
+            for worker in range(self.stats[stage].workers)
+        ]
+        for thread in threads:
+            thread.start()
+        first = self.STAGES[0]
+        for order in orders:
+            self.__put(first, order)
+        for _ in range(self.stats[first].workers):
+            self.__queues[first].put(None)
+        for thread in threads:
+            thread.join()
+        return boxed
+
+    def report(self) -> str:
+        return "\n".join(str(self.stats[stage]) for stage in self.STAGES)
+
+    def __put(self, stage: str, item):
+        queue = self.__queues[stage]
+        queue.put(item)
+        stats = self.stats[stage]
+        depth = queue.qsize()
+        if depth > stats.max_depth:
+            with self.__lock:
+                stats.max_depth = max(stats.max_depth, depth)
+
+    def __work(self, index: int, boxed: List["Pizza"]):
+        stage = self.STAGES[index]
+        stats = self.stats[stage]
+        following = self.STAGES[index + 1] if index + 1 < len(self.STAGES) else None
+        queue = self.__queues[stage]
+        delay = self.delays.get(stage, 0.0)
+        with self.__lock:
+            if stats.started is None:
+                stats.started = time.perf_counter()
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            began = time.perf_counter()
+            try:
+                pizza = self.store.create_pizza(item) if index == 0 else item
+                getattr(pizza, stage)(verbose=False)
+                if delay:
+                    time.sleep(delay)
+            except Exception:
+                with self.__lock:
+                    stats.failed += 1
+                continue
+            with self.__lock:
+                stats.processed += 1
+                stats.busy += time.perf_counter() - began
+            if following is None:
+                with self.__lock:
+                    boxed.append(pizza)
+            else:
+                self.__put(following, pizza)
+        with self.__lock:
+            self.__remaining[stage] -= 1
+            last = self.__remaining[stage] == 0
+            if last:
+                stats.finished = time.perf_counter()
+        if last and following is not None:
+            for _ in range(self.stats[following].workers):
+                self.__queues[following].put(None)
@@ -0,0 +1,270 @@
+from abc import abstractmethod, ABC
+from enum import Enum
+import importlib
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple, Type
+
+
+class Pizzas(Enum):
+    pass
+
+
+class PizzaException(Exception):
+    pass
+
+
+class IngredientSet(NamedTuple):
+    dough: str
+    sauce: str
+    toppings: Tuple[str, ...]
+
+
+class Pizza(ABC):
+    # Compact pizza: a name on the class, a shared (flyweight) IngredientSet
+    # and the list of steps it has been through.
+    __slots__ = ("ingredients", "pizza")
+    name: str
+
+    def __init__(self, ingredients: IngredientSet) -> None:
+        self.ingredients = ingredients
+        self.pizza = []
+
+    @property
+    def dough(self) -> str:
+        return self.ingredients.dough
+
+    @property
+    def sauce(self) -> str:
+        return self.ingredients.sauce
+
+    @property
+    def toppings(self) -> Tuple[str, ...]:
+        return self.ingredients.toppings
+
+    def prepare(self, verbose: bool = True):
+        self.pizza.append("Prepared")
+        if not verbose:
+            return
+        list_of_toppings = "\n".join(
+            [
+                f"    {index}. {topping}"
+                for index, topping in enumerate(self.toppings, 1)
+            ]
+        )
+        print(
+            f"""Preparing {self.name}
+Rolling Out Dough to Make a {self.dough} Base
+Adding Layer of {self.sauce} Sauce
+Adding Toppings:
+{list_of_toppings}
+"""
+        )
+
+    def bake(self, verbose: bool = True):
+        self.pizza.append("Baked")
+        if verbose:
+            print("Baked for 15 minutes at 150°C")
+
+    def cut(self, verbose: bool = True):
+        self.pizza.append("Cut")
+        if verbose:
+            print("Cut Diagonally into 8 Slices - Triangular")
+
+    def box(self, verbose: bool = True):
+        self.pizza.append("Boxed")
+        if verbose:
+            print("Boxed Pizza - Square")
+
+
+class PizzaIngredientFactory(ABC):
+    def __init__(self, pizza: Pizzas) -> None:
+        self.pizza = pizza
+
+    @abstractmethod
+    def create_dough(self):
+        pass
+
+    @abstractmethod
+    def create_sauce(self):
+        pass
+
+    @abstractmethod
+    def create_toppings(self):
+        pass
+
+
+class StandardPizzas(Pizzas):
+    CHEESEPIZZA = "cheese"
+    PEPPERONIPIZZA = "pepperoni"
+
+
+class NYStylePizzas(Pizzas):
+    CHEESEPIZZA = "cheese"
+    PEPPERONIPIZZA = "pepperoni"
+
+
+class ChicagoStylePizzas(Pizzas):
+    CHEESEPIZZA = "cheese"
+    PEPPERONIPIZZA = "pepperoni"
+
+
+# Registry: styles name the module that implements them, and that module
+# registers its pizzas and ingredient factory when it is first imported, i.e.
+# on the first order of that style. Each pizza then resolves to its class and
+# shared, immutable IngredientSet with a single dict lookup.
+_STYLES: Dict[Type[Pizzas], str] = {}
+_REGIONS: Dict[str, Type[Pizzas]] = {}
+_PIZZAS: Dict[Pizzas, Type[Pizza]] = {}
+_INGREDIENT_FACTORIES: Dict[Type[Pizzas], Type[PizzaIngredientFactory]] = {}
+_ORDERS: Dict[Pizzas, Tuple[Type[Pizza], IngredientSet]] = {}
+
+
+def register_style(style: Type[Pizzas], module: str, region: str = None):
+    # region: name of the regional store that sells only this style.
+    _STYLES[style] = module
+    if region is not None:
+        _REGIONS[region] = style
+
+
+def register_pizza(pizza: Pizzas) -> Callable[[Type[Pizza]], Type[Pizza]]:
+    def register(cls: Type[Pizza]) -> Type[Pizza]:
+        _PIZZAS[pizza] = cls
+        _ORDERS.pop(pizza, None)
+        return cls
+
+    return register
+
+
+def register_ingredients(
+    style: Type[Pizzas],
+) -> Callable[[Type[PizzaIngredientFactory]], Type[PizzaIngredientFactory]]:
+    def register(cls: Type[PizzaIngredientFactory]) -> Type[PizzaIngredientFactory]:
+        _INGREDIENT_FACTORIES[style] = cls
+        for pizza in style:
+            _ORDERS.pop(pizza, None)
+        return cls
+
+    return register
+
+
+def make_pizza(pizza: Pizzas) -> Pizza:
+    order = _ORDERS.get(pizza)
+    if order is None:
+        order = _ORDERS[pizza] = _resolve(pizza)
+    cls, ingredients = order
+    return cls(ingredients)
+
+
+def _resolve(pizza: Pizzas) -> Tuple[Type[Pizza], IngredientSet]:
+    if not isinstance(pizza, Pizzas):
+        raise PizzaException("Invalid Pizza")
+    style = type(pizza)
+    if pizza not in _PIZZAS and style in _STYLES:
+        importlib.import_module(_STYLES[style])
+    if pizza not in _PIZZAS or style not in _INGREDIENT_FACTORIES:
+        raise PizzaException(f"No Registered Recipe for {style.__name__}.{pizza.name}")
+    source = _INGREDIENT_FACTORIES[style](pizza)
+    ingredients = IngredientSet(source.create_dough(), source.create_sauce(), tuple(source.create_toppings()))
+    return _PIZZAS[pizza], ingredients
+
+
+class OrderResult(NamedTuple):
+    order: int
+    pizza: Pizzas
+    name: str
+    steps: Tuple[str, ...]
+    error: str = None
+
+
+class BatchReport:
+    # Per-order results of a batch plus one aggregated summary.
+    def __init__(self, results: List[OrderResult], pizzas: List[Pizza], recipes: Dict[Pizzas, Pizza]) -> None:
+        self.results = results
+        self.pizzas = pizzas
+        self.__recipes = recipes
+
+    @property
+    def failed(self) -> List[OrderResult]:
+        return [result for result in self.results if result.error is not None]
+
+    def __str__(self) -> str:
+        counts: Dict[Pizzas, int] = {}
+        for result in self.results:
+            if result.error is None:
+                counts[result.pizza] = counts.get(result.pizza, 0) + 1
+        lines = [f"Batch of {len(self.results)} Orders"]
+        for pizza, count in counts.items():
+            recipe = self.__recipes[pizza]
+            lines.append(
+                f"    {count} x {recipe.name} - {recipe.dough} Base, {recipe.sauce} Sauce, "
+                f"Toppings: {', '.join(recipe.toppings) or 'None'}"
+            )
+        lines.append(f"Prepared, Baked, Cut and Boxed: {len(self.pizzas)}")
+        for result in self.failed:
+            lines.append(f"Order {result.order} Failed: {result.error}")
+        return "\n".join(lines)
+
+
+def order_in_bulk(create_pizza: Callable[[Pizzas], Pizza], orders: Iterable[Pizzas]) -> BatchReport:
+    # Groups identical orders so each kind is validated and resolved once, then
+    # runs every pizza through its steps without per-step console output.
+    groups: Dict[Pizzas, List[int]] = {}
+    orders = list(orders)
+    for index, pizza in enumerate(orders):
+        groups.setdefault(pizza, []).append(index)
+
+    results: List[OrderResult] = [None] * len(orders)
+    pizzas: List[Pizza] = []
+    recipes: Dict[Pizzas, Pizza] = {}
+    for pizza, indexes in groups.items():
+        try:
+            recipe = create_pizza(pizza)
+        except PizzaException as error:
+            for index in indexes:
+                results[index] = OrderResult(index, pizza, None, (), str(error))
+            continue
+        recipes[pizza] = recipe
+        made = [recipe] + [type(recipe)(recipe.ingredients) for _ in indexes[1:]]
+        for step in ("prepare", "bake", "cut", "box"):
+            for made_pizza in made:
+                getattr(made_pizza, step)(verbose=False)
+        for index, made_pizza in zip(indexes, made):
+            results[index] = OrderResult(index, pizza, recipe.name, tuple(made_pizza.pizza))
+        pizzas.extend(made)
+    return BatchReport(results, pizzas, recipes)
+
+
+class PizzaStore(ABC):
+    def order_pizza(self, pizza: Pizzas):
+        pizza = self.create_pizza(pizza)
+        pizza.prepare()
+        pizza.bake()
+        pizza.cut()
+        pizza.box()
+
+    def order_pizzas(self, pizzas: Iterable[Pizzas]) -> BatchReport:
+        return order_in_bulk(self.create_pizza, pizzas)
+
+    @abstractmethod
+    def create_pizza(self, pizza: Pizzas):
+        pass
+
+
+class RegionalPizzaStore(PizzaStore):
+    # Store that only accepts the style registered for its region, so a new
+    # regional style needs a register_style call, not a new store class.
+    region: str = None
+
+    def __init__(self, region: str = None) -> None:
+        self.region = region or self.region
+        if self.region not in _REGIONS:
+            raise PizzaException(f"No Pizza Style Registered for {self.region}")
+
+    def create_pizza(self, pizza: Pizzas):
+        if type(pizza) is not _REGIONS[self.region]:
+            raise PizzaException(f"Invalid {self.region} Pizza")
+        return make_pizza(pizza)
+
+
+register_style(StandardPizzas, "standard_style")
+register_style(NYStylePizzas, "ny_style", region="NY")
+register_style(ChicagoStylePizzas, "chicago_style", region="Chicago")
@@ -0,0 +1,36 @@
+from pizzas import (
+    StandardPizzas,
+    Pizza,
+    PizzaIngredientFactory,
+    register_ingredients,
+    register_pizza,
+)
+
+
+@register_pizza(StandardPizzas.CHEESEPIZZA)
+class CheesePizza(Pizza):
+    __slots__ = ()
+    name = "Regular Cheese Pizza"
+
+
+@register_pizza(StandardPizzas.PEPPERONIPIZZA)
+class PepperoniPizza(Pizza):
+    __slots__ = ()
+    name = "Regular Pepperoni Pizza"
+
+
+@register_ingredients(StandardPizzas)
+class StandardIngredientFactory(PizzaIngredientFactory):
+    TOPPINGS = {
+        StandardPizzas.CHEESEPIZZA: ("Cheese",),
+        StandardPizzas.PEPPERONIPIZZA: ("Cheese", "Pepperoni"),
+    }
+
+    def create_dough(self):
+        return "Normal"
+
+    def create_sauce(self):
+        return "Marinara"
+
+    def create_toppings(self):
+        return self.TOPPINGS.get(self.pizza, ())
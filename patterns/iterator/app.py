@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from heapq import merge
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Type, TypeVar
+
+Component = TypeVar("Component", bound="IComponent")
 
 
 class IComponent(ABC):
@@ -12,16 +18,63 @@ class IComponent(ABC):
         pass
 
 
+class Pool(Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 class Window:
+    # Keeps, next to the children list, the positions of each concrete
+    # component type so of_type only visits matching children.
     def __init__(self):
         self.children = []
+        self.__positions: Dict[type, List[int]] = {}
 
     def add_child(self, child: IComponent):
+        self.__positions.setdefault(type(child), []).append(len(self.children))
         self.children.append(child)
 
     def __iter__(self) -> Iterator[IComponent]:
         return iter(self.children)
 
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def of_type(self, component_type: Type[Component]) -> Iterator[Component]:
+        # Children that are component_type instances (subclasses included), in
+        # the order they were added.
+        matches = [positions for kind, positions in self.__positions.items() if issubclass(kind, component_type)]
+        positions = matches[0] if len(matches) == 1 else merge(*matches)
+        return map(self.children.__getitem__, positions)
+
+    def where(
+        self,
+        predicate: Callable[[IComponent], bool],
+        component_type: Type[Component] = IComponent,
+    ) -> Iterator[Component]:
+        return filter(predicate, self.of_type(component_type))
+
+    def map_execute(
+        self,
+        components: Iterable[IComponent] = None,
+        pool: Pool = Pool.THREAD,
+        workers: int = None,
+        chunk_size: int = 1024,
+    ) -> List[str]:
+        # Runs execute() on every component (all children by default) in chunks
+        # on a thread or process pool; results come back in component order.
+        # The process pool needs picklable components and pays for pickling
+        # them, so it only wins when execute() does real work.
+        components = iter(self.children if components is None else components)
+        chunks = iter(lambda: list(islice(components, chunk_size)), [])
+        executor = ThreadPoolExecutor if pool is Pool.THREAD else ProcessPoolExecutor
+        with executor(max_workers=workers) as running:
+            return [result for chunk in running.map(_execute_chunk, chunks) for result in chunk]
+
+
+def _execute_chunk(chunk: List[IComponent]) -> List[str]:
+    return [component.execute() for component in chunk]
+
 
 class Button(IComponent):
     def __init__(self, name, text):
@@ -47,13 +100,27 @@ class TextBox(IComponent):
         return "I am a (TextBox)"
 
 
-# Usage:
-root = Window()
-button1 = Button("Button 1", "Click me")
-textBox1 = TextBox("Text Box 1", "Enter text")
-root.add_child(button1)
-root.add_child(textBox1)
-
-for component in root:
-    print(component.get_name())
-    print(component.execute())
+if __name__ == "__main__":
+    # Usage:
+    root = Window()
+    button1 = Button("Button 1", "Click me")
+    textBox1 = TextBox("Text Box 1", "Enter text")
+    root.add_child(button1)
+    root.add_child(textBox1)
+
+    for component in root:
+        print(component.get_name())
+        print(component.execute())
+
+    # Only the buttons, and only the text boxes asking for text
+    for button in root.of_type(Button):
+        print(button.execute())
+    for text_box in root.where(lambda box: box.placeholder.startswith("Enter"), TextBox):
+        print(text_box.execute())
+
+    # A large generated form, executed on a pool
+    form = Window()
+    for index in range(10_000):
+        form.add_child(Button(f"Button {index}", "Submit") if index % 2 else TextBox(f"Text Box {index}", "Field"))
+    results = form.map_execute(pool=Pool.PROCESS, workers=4)
+    print(len(results), results[-1])
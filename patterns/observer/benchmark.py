@@ -0,0 +1,46 @@
+import argparse
+from contextlib import redirect_stdout
+import io
+import random
+import time
+
+from forecast import ForecastEngine
+from main import ForecastConditions, WeatherDataSubject
+
+
+def per_observer(readings) -> float:
+    subjects = []
+    for _ in readings:
+        subject = WeatherDataSubject()
+        ForecastConditions(subject)
+        subjects.append(subject)
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for subject, (temperature, pressure, humidity) in zip(subjects, readings):
+            subject.update(temperature=temperature, pressure=pressure, humidity=humidity)
+    return time.perf_counter() - started
+
+
+def vectorized(readings) -> float:
+    temperatures, pressures, humidities = zip(*readings)
+    engine = ForecastEngine()
+    started = time.perf_counter()
+    engine.forecast(temperatures, pressures, humidities)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-observer vs vectorized forecasts.")
+    parser.add_argument("--stations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    readings = [
+        (random.uniform(-10, 35), random.uniform(95, 105), random.uniform(10, 90))
+        for _ in range(args.stations)
+    ]
+    observer_time = per_observer(readings)
+    engine_time = vectorized(readings)
+    print(f"Stations: {args.stations}")
+    print(f"Per-Observer Path: {observer_time * 1000:.1f}ms")
+    print(f"Forecast Engine: {engine_time * 1000:.1f}ms")
+    print(f"Speed-Up: {observer_time / engine_time:.1f}x")
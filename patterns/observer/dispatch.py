@@ -0,0 +1,150 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+import threading
+import time
+from typing import TYPE_CHECKING, Deque, Dict, Iterable
+import weakref
+
+if TYPE_CHECKING:
+    from main import IObserver
+
+
+class Backpressure(Enum):
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
+class ObserverMetrics:
+    def __init__(self) -> None:
+        self.delivered = 0
+        self.dropped = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ObserverMetrics(delivered={self.delivered}, dropped={self.dropped}, "
+            f"timed_out={self.timed_out}, failed={self.failed}, "
+            f"average_latency={self.average_latency:.6f}s, max_latency={self.max_latency:.6f}s)"
+        )
+
+
+class IDispatcher(ABC):
+    @abstractmethod
+    def dispatch(self, observers: Iterable["IObserver"]):
+        pass
+
+
+class SyncDispatcher(IDispatcher):
+    # Calls every observer on the notifying thread, one after another.
+    def dispatch(self, observers: Iterable["IObserver"]):
+        for observer in observers:
+            observer.update()
+
+
+class _Mailbox:
+    def __init__(self) -> None:
+        self.queue: Deque[float] = deque()
+        self.scheduled = False
+        self.metrics = ObserverMetrics()
+
+
+class ThreadPoolDispatcher(IDispatcher):
+    # Fans notifications out to a thread pool. Each observer owns a bounded
+    # mailbox that is drained by at most one worker at a time, so a slow
+    # observer only ever occupies one worker and never stalls the notifier.
+    #
+    # capacity: pending notifications kept per observer.
+    # backpressure: DROP_OLDEST discards the stalest pending notification,
+    #   BLOCK makes the notifier wait for room (up to timeout).
+    # timeout: notifications older than this (seconds) are skipped instead
+    #   of delivered, and bound how long BLOCK may wait.
+    def __init__(
+        self,
+        max_workers: int = None,
+        capacity: int = 16,
+        backpressure: Backpressure = Backpressure.DROP_OLDEST,
+        timeout: float = None,
+    ) -> None:
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="observer")
+        self.__capacity = capacity
+        self.__backpressure = backpressure
+        self.__timeout = timeout
+        self.__lock = threading.Lock()
+        self.__not_full = threading.Condition(self.__lock)
+        self.__idle = threading.Condition(self.__lock)
+        self.__mailboxes: Dict["IObserver", _Mailbox] = weakref.WeakKeyDictionary()
+
+    def dispatch(self, observers: Iterable["IObserver"]):
+        enqueued = time.monotonic()
+        for observer in observers:
+            self.__enqueue(observer, enqueued)
+
+    def metrics(self) -> Dict["IObserver", ObserverMetrics]:
+        with self.__lock:
+            return {observer: mailbox.metrics for observer, mailbox in self.__mailboxes.items()}
+
+    def join(self, timeout: float = None) -> bool:
+        # Waits until every pending notification has been handled.
+        with self.__lock:
+            return self.__idle.wait_for(
+                lambda: not any(mailbox.scheduled for mailbox in self.__mailboxes.values()), timeout
+            )
+
+    def shutdown(self, wait: bool = True):
+        self.__executor.shutdown(wait=wait)
+
+    def __enqueue(self, observer: "IObserver", enqueued: float):
+        with self.__lock:
+            mailbox = self.__mailboxes.get(observer)
+            if mailbox is None:
+                mailbox = self.__mailboxes[observer] = _Mailbox()
+            if len(mailbox.queue) >= self.__capacity:
+                if self.__backpressure is Backpressure.DROP_OLDEST:
+                    mailbox.queue.popleft()
+                    mailbox.metrics.dropped += 1
+                elif not self.__not_full.wait_for(
+                    lambda: len(mailbox.queue) < self.__capacity, self.__timeout
+                ):
+                    mailbox.metrics.dropped += 1
+                    return
+            mailbox.queue.append(enqueued)
+            if not mailbox.scheduled:
+                mailbox.scheduled = True
+                self.__executor.submit(self.__drain, observer, mailbox)
+
+    def __drain(self, observer: "IObserver", mailbox: _Mailbox):
+        metrics = mailbox.metrics
+        while True:
+            with self.__lock:
+                if not mailbox.queue:
+                    mailbox.scheduled = False
+                    self.__idle.notify_all()
+                    return
+                enqueued = mailbox.queue.popleft()
+                self.__not_full.notify_all()
+            if self.__timeout is not None and time.monotonic() - enqueued > self.__timeout:
+                with self.__lock:
+                    metrics.timed_out += 1
+                continue
+            try:
+                observer.update()
+            except Exception:
+                with self.__lock:
+                    metrics.failed += 1
+                continue
+            latency = time.monotonic() - enqueued
+            with self.__lock:
+                metrics.delivered += 1
+                metrics.total_latency += latency
+                metrics.last_latency = latency
+                metrics.max_latency = max(metrics.max_latency, latency)
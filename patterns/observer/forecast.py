@@ -0,0 +1,74 @@
+from array import array
+from enum import Enum
+import math
+from operator import add, mul
+import random
+from typing import List, Sequence
+
+
+class Outlook(Enum):
+    COLD = "It's Going to be Cold."
+    HOTTER = "It's Going to be Hotter."
+    COLDER = "It's Going to be Colder."
+    SAME = "Much of the Same."
+
+
+class Forecast:
+    # Column-oriented forecast for N stations, index i is station i.
+    # Missing readings are NaN.
+    def __init__(self, temperature: array, pressure: array, humidity: array, outlooks: List[Outlook]) -> None:
+        self.temperature = temperature
+        self.pressure = pressure
+        self.humidity = humidity
+        self.outlooks = outlooks
+
+    def __len__(self) -> int:
+        return len(self.outlooks)
+
+
+class ForecastEngine:
+    # Forecasts many stations in one pass over column arrays instead of one
+    # observer per station. Every station drifts all of its readings in the
+    # same random direction, by up to SPREADS[field].
+    SPREADS = {"temperature": 40, "pressure": 100, "humidity": 10}
+
+    def __init__(self, seed: int = None) -> None:
+        self.__random = random.Random(seed)
+
+    def forecast(
+        self,
+        temperatures: Sequence[float],
+        pressures: Sequence[float],
+        humidities: Sequence[float],
+    ) -> Forecast:
+        temperatures = self.__column(temperatures)
+        pressures = self.__column(pressures)
+        humidities = self.__column(humidities)
+        stations = len(temperatures)
+        if not len(pressures) == len(humidities) == stations:
+            raise ValueError("Readings for every Station are Required.")
+
+        directions = self.__random.choices((1, -1), k=stations)
+        forecast = Forecast(
+            self.__drift(temperatures, directions, self.SPREADS["temperature"]),
+            self.__drift(pressures, directions, self.SPREADS["pressure"]),
+            self.__drift(humidities, directions, self.SPREADS["humidity"]),
+            [],
+        )
+        cold, hotter, colder, same = Outlook.COLD, Outlook.HOTTER, Outlook.COLDER, Outlook.SAME
+        # NaN compares False everywhere, so stations without a temperature fall through to SAME.
+        forecast.outlooks = [
+            cold if new < 15 else hotter if new > old + 3 else colder if new < old - 3 else same
+            for old, new in zip(temperatures, forecast.temperature)
+        ]
+        return forecast
+
+    def __drift(self, column: array, directions: List[int], spread: int) -> array:
+        deltas = self.__random.choices(range(spread + 1), k=len(column))
+        return array("d", map(add, column, map(mul, directions, deltas)))
+
+    @staticmethod
+    def __column(values: Sequence[float]) -> array:
+        if isinstance(values, array) and values.typecode == "d":
+            return values
+        return array("d", (math.nan if value is None else value for value in values))
@@ -0,0 +1,265 @@
+import argparse
+from enum import Enum
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+import zlib
+
+from main import WeatherDataSubject
+
+
+class ReplayException(Exception):
+    pass
+
+
+class ReplayFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def of(cls, path: str) -> "ReplayFormat":
+        return cls.NDJSON if path.endswith((".ndjson", ".jsonl")) else cls.CSV
+
+
+class HubReport:
+    def __init__(self, readings: int, stations: int, elapsed: float, shards: List[int]) -> None:
+        self.readings = readings
+        self.stations = stations
+        self.elapsed = elapsed
+        self.shards = shards
+
+    @property
+    def readings_per_second(self) -> float:
+        return self.readings / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Replayed {self.readings} readings for {self.stations} stations in {self.elapsed:.2f}s "
+            f"({self.readings_per_second:,.0f} readings/s across {len(self.shards)} shards)"
+        )
+
+
+class WeatherStationHub:
+    # Partitions stations across worker processes, each owning the
+    # WeatherDataSubject of its stations. Readings are routed by station id so
+    # every station's readings stay in order on a single worker. Console
+    # output on the workers is discarded: at fleet scale it would dominate.
+    #
+    # observers: module-level (picklable) function called with each new
+    #   subject to attach its observers, e.g. `def attach(subject): WeatherStatistics(subject)`.
+    def __init__(
+        self,
+        workers: int = None,
+        observers: Callable[[WeatherDataSubject], None] = None,
+        batch_size: int = 2000,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.observers = observers
+        self.batch_size = batch_size
+
+    def shard(self, station: str) -> int:
+        return zlib.crc32(station.encode()) % self.workers
+
+    def replay(self, path: str) -> HubReport:
+        replay_format = ReplayFormat.of(path)
+        started = time.perf_counter()
+        with open(path, encoding="utf-8") as replay:
+            columns = replay.readline().strip().split(",") if replay_format is ReplayFormat.CSV else None
+            inboxes = [multiprocessing.Queue(maxsize=64) for _ in range(self.workers)]
+            for inbox in inboxes:
+                # Workers read up to the final None, so nothing is lost on success;
+                # after a failure this stops exit from waiting on undelivered batches.
+                inbox.cancel_join_thread()
+            outbox = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(
+                    target=_run_shard,
+                    args=(shard, inbox, outbox, replay_format, columns, self.observers),
+                    daemon=True,
+                )
+                for shard, inbox in enumerate(inboxes)
+            ]
+            for process in processes:
+                process.start()
+
+            station_of = _station_reader(replay_format, columns)
+            batches: List[List[str]] = [[] for _ in range(self.workers)]
+            results: List[Tuple[int, str, int, int]] = []
+            shards: Dict[str, int] = {}
+            for line in replay:
+                if not line.strip():
+                    continue
+                station = station_of(line)
+                shard = shards.get(station)
+                if shard is None:
+                    shard = shards[station] = self.shard(station)
+                batch = batches[shard]
+                batch.append(line)
+                if len(batch) >= self.batch_size:
+                    _send(inboxes[shard], batch, processes[shard], processes, outbox, results)
+                    batches[shard] = []
+            for inbox, batch, process in zip(inboxes, batches, processes):
+                if batch:
+                    _send(inbox, batch, process, processes, outbox, results)
+                _send(inbox, None, process, processes, outbox, results)
+
+        while len(results) < len(processes):
+            results.append(_receive(outbox, processes, _reported(results)))
+        results.sort()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+        return HubReport(
+            readings=sum(readings for _, _, readings, _ in results),
+            stations=sum(stations for _, _, _, stations in results),
+            elapsed=elapsed,
+            shards=[readings for _, _, readings, _ in results],
+        )
+
+
+def write_replay(path: str, stations: int, readings: int, seed: int = None):
+    # Records a synthetic replay file: `readings` readings for each station.
+    replay_format = ReplayFormat.of(path)
+    generator = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as replay:
+        if replay_format is ReplayFormat.CSV:
+            replay.write("station,temperature,humidity,pressure\n")
+        for _ in range(readings):
+            for station in range(stations):
+                temperature = round(generator.uniform(-10, 35), 1)
+                humidity = round(generator.uniform(10, 90), 1)
+                pressure = round(generator.uniform(95, 105), 1)
+                if replay_format is ReplayFormat.CSV:
+                    replay.write(f"station-{station},{temperature},{humidity},{pressure}\n")
+                else:
+                    replay.write(
+                        json.dumps(
+                            {
+                                "station": f"station-{station}",
+                                "temperature": temperature,
+                                "humidity": humidity,
+                                "pressure": pressure,
+                            }
+                        )
+                        + "\n"
+                    )
+
+
+def _station_reader(replay_format: ReplayFormat, columns: List[str]) -> Callable[[str], str]:
+    # Pulls only the station id out of a line; full parsing happens on the workers.
+    if replay_format is ReplayFormat.NDJSON:
+        pattern = re.compile(r'"station"\s*:\s*"?([^",}]+)')
+        return lambda line: pattern.search(line).group(1)
+    index = columns.index("station")
+    return lambda line: line.split(",", index + 1)[index]
+
+
+def _reading_parser(replay_format: ReplayFormat, columns: List[str]) -> Callable[[str], Tuple[str, dict]]:
+    fields = WeatherDataSubject.FIELDS
+    if replay_format is ReplayFormat.NDJSON:
+
+        def parse(line: str) -> Tuple[str, dict]:
+            record = json.loads(line)
+            return str(record["station"]), {
+                field: record[field] for field in fields if record.get(field) is not None
+            }
+
+        return parse
+
+    station_index = columns.index("station")
+    field_indexes = [(field, columns.index(field)) for field in fields if field in columns]
+
+    def parse(line: str) -> Tuple[str, dict]:
+        values = line.rstrip("\n").split(",")
+        return values[station_index], {field: float(values[index]) for field, index in field_indexes if values[index]}
+
+    return parse
+
+
+# Workers only write to the outbox once, when they finish or fail; a failure
+# raises ReplayException as soon as it is seen. Waits poll, so a worker that
+# died without reporting is noticed instead of waited on forever.
+def _send(inbox, batch, process, processes, outbox, results):
+    while True:
+        if not outbox.empty():
+            results.append(_receive(outbox, processes, _reported(results)))
+        try:
+            inbox.put(batch, timeout=0.1)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                results.append(_receive(outbox, processes, _reported(results)))
+
+
+def _reported(results):
+    return {shard for shard, _, _, _ in results}
+
+
+def _receive(outbox, processes, reported) -> Tuple[int, str, int, int]:
+    while True:
+        try:
+            result = outbox.get(timeout=0.1)
+        except queue.Empty:
+            for shard, process in enumerate(processes):
+                if shard not in reported and not process.is_alive():
+                    try:
+                        result = outbox.get(timeout=1.0)
+                    except queue.Empty:
+                        _fail((shard, f"Worker exited with code {process.exitcode}.", 0, 0), processes)
+                    break
+            else:
+                continue
+        if result[1] is not None:
+            _fail(result, processes)
+        return result
+
+
+def _fail(result, processes):
+    for process in processes:
+        process.terminate()
+    shard, error, _, _ = result
+    raise ReplayException(f"Shard {shard} failed: {error}")
+
+
+def _run_shard(shard: int, inbox, outbox, replay_format: ReplayFormat, columns: List[str], observers):
+    sys.stdout = open(os.devnull, "w")
+    parse = _reading_parser(replay_format, columns)
+    subjects: Dict[str, WeatherDataSubject] = {}
+    readings = 0
+    try:
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                break
+            for line in batch:
+                station, reading = parse(line)
+                subject = subjects.get(station)
+                if subject is None:
+                    subject = subjects[station] = WeatherDataSubject()
+                    if observers is not None:
+                        observers(subject)
+                subject.update(**reading)
+                readings += 1
+    except Exception as exc:
+        outbox.put((shard, f"{type(exc).__name__}: {exc} (reading {readings + 1} of the shard)", readings, len(subjects)))
+        return
+    outbox.put((shard, None, readings, len(subjects)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded station readings through the observer pipeline.")
+    parser.add_argument("path", help="CSV or NDJSON (.ndjson/.jsonl) replay file")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--generate", type=int, metavar="STATIONS", help="record a synthetic replay first")
+    parser.add_argument("--readings", type=int, default=100, help="readings per station when generating")
+    args = parser.parse_args()
+
+    if args.generate:
+        write_replay(args.path, args.generate, args.readings)
+    print(WeatherStationHub(workers=args.workers).replay(args.path))
@@ -1,7 +1,15 @@
 
 from abc import ABC, ABCMeta, abstractmethod
-import random
-from typing import List
+from contextlib import contextmanager
+import threading
+import time
+from typing import Dict, Iterable, Set, Tuple
+
+from dispatch import IDispatcher, SyncDispatcher, ThreadPoolDispatcher
+from forecast import ForecastEngine
+from registry import ObserverRegistry
+from rolling import RollingStatistics
+from timeseries import ReadingHistory
 
 
 class IObserver(ABC):
@@ -9,6 +17,9 @@ class IObserver(ABC):
     def update(self):
         pass
 
+class WeatherDataException(Exception):
+    pass
+
 class ISubject(ABC):
     @abstractmethod
     def register(self, observer: IObserver):
@@ -23,12 +34,34 @@ class ISubject(ABC):
         pass
 
 class WeatherDataSubject(ISubject):
+    FIELDS: Tuple[str, ...] = ("temperature", "humidity", "pressure")
+
     __temperature: float = None
     __humidity: float = None
     __pressure: float = None
     
-    def __init__(self) -> None:
-        self.__observers: List[IObserver] = []
+    def __init__(
+        self,
+        notify_interval: float = 0.0,
+        dispatcher: IDispatcher = None,
+        weak_observers: bool = False,
+        history: ReadingHistory = None,
+    ) -> None:
+        # notify_interval: throttle window (seconds) for high-frequency feeds.
+        # Changes inside the window are coalesced into one trailing notification.
+        # dispatcher: how observers are called, synchronously by default.
+        # weak_observers: hold observers weakly so collected ones drop out.
+        # history: bounded store every committed reading is recorded into.
+        self.__history = history
+        self.__dispatcher = dispatcher if dispatcher is not None else SyncDispatcher()
+        self.__observers = ObserverRegistry(self.FIELDS, weak=weak_observers)
+        self.__notify_interval = notify_interval
+        self.__last_notified: float = None
+        self.__batch_depth = 0
+        self.__pending: Set[str] = set()
+        self.__revisions: Dict[str, int] = dict.fromkeys(self.FIELDS, 0)
+        self.__timer: threading.Timer = None
+        self.__lock = threading.RLock()
     
     @property
     def temperature(self):
@@ -41,38 +74,119 @@ class WeatherDataSubject(ISubject):
     @property
     def pressure(self):
         return self.__pressure
+
+    @property
+    def history(self) -> ReadingHistory:
+        return self.__history
+
+    @property
+    def revisions(self) -> Dict[str, int]:
+        # How many times each field has been set; lets observers tell which
+        # readings are new since they last looked.
+        return dict(self.__revisions)
         
     @temperature.setter
     def temperature(self, value):
         self.__temperature = value
-        self.notify()
+        self.__revisions["temperature"] += 1
+        self.__changed("temperature")
 
     @humidity.setter
     def humidity(self, value):
         self.__humidity = value
-        self.notify()
+        self.__revisions["humidity"] += 1
+        self.__changed("humidity")
         
     @pressure.setter
     def pressure(self, value):
         self.__pressure = value
-        self.notify()
+        self.__revisions["pressure"] += 1
+        self.__changed("pressure")
+
+    def update(self, **fields):
+        # Applies a full reading and notifies observers once.
+        unknown = [field for field in fields if field not in self.FIELDS]
+        if unknown:
+            raise WeatherDataException(f"Unknown Weather Fields: {', '.join(unknown)}.")
+        with self.batch():
+            for field, value in fields.items():
+                setattr(self, field, value)
+
+    @contextmanager
+    def batch(self):
+        # Defers notifications until the outermost batch exits.
+        # Readings are rolled back if the batch raises.
+        with self.__lock:
+            snapshot = (self.__temperature, self.__humidity, self.__pressure)
+            revisions = dict(self.__revisions)
+            self.__batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.__temperature, self.__humidity, self.__pressure = snapshot
+                self.__revisions = revisions
+                if self.__batch_depth == 1:
+                    self.__pending.clear()
+                raise
+            finally:
+                self.__batch_depth -= 1
+            if self.__batch_depth == 0 and self.__pending:
+                self.__changed(*self.__pending)
+
+    def flush(self):
+        # Delivers a notification held back by the throttle window, if any.
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            if self.__pending:
+                self.notify(self.__pending)
+
+    def __changed(self, *fields: str):
+        with self.__lock:
+            self.__pending.update(fields)
+            if self.__batch_depth:
+                return
+            if self.__history is not None:
+                self.__history.record(time.time(), [getattr(self, field) for field in self.__history.fields])
+            if self.__notify_interval and self.__last_notified is not None:
+                elapsed = time.monotonic() - self.__last_notified
+                if elapsed < self.__notify_interval:
+                    if self.__timer is None:
+                        self.__timer = threading.Timer(self.__notify_interval - elapsed, self.flush)
+                        self.__timer.daemon = True
+                        self.__timer.start()
+                    return
+            self.flush()
         
-    def register(self, observer: IObserver):
-        self.__observers.append(observer)
+    def register(self, observer: IObserver, fields: Iterable[str] = None):
+        # fields: readings the observer subscribes to, all of them by default.
+        fields = frozenset(self.FIELDS if fields is None else fields)
+        unknown = fields.difference(self.FIELDS)
+        if unknown or not fields:
+            raise WeatherDataException(f"Invalid Subscription Fields: {', '.join(sorted(unknown)) or 'None'}.")
+        self.__observers.add(observer, fields)
     
     def deregister(self, observer: IObserver):
-        self.__observers.remove(observer)
+        if not self.__observers.discard(observer):
+            raise WeatherDataException("Observer is not Registered.")
     
-    def notify(self):
+    def notify(self, fields: Iterable[str] = None):
+        # Wakes only the observers subscribed to the changed fields.
+        # Called without fields, every registered observer is notified.
+        with self.__lock:
+            changed = frozenset(fields) if fields else None
+            self.__pending.clear()
+            self.__last_notified = time.monotonic()
+        observers = self.__observers.subscribers(changed)
         print("+=========================**Notifying**=========================+")
         print()
-        for observer in self.__observers:
-            observer.update()
+        self.__dispatcher.dispatch(observers)
             
 class WeatherConditions(IObserver):
-    def __init__(self, subject: ISubject) -> None:
+    def __init__(self, subject: ISubject, fields: Iterable[str] = None) -> None:
         self.subject = subject
-        self.subject.register(self)
+        self.subject.register(self, fields)
         
     def update(self):
         print("+---------------------------------------+")
@@ -88,9 +202,10 @@ class WeatherConditions(IObserver):
         print(f"Humidity: {current_humidity}\n")
         
 class ForecastConditions(IObserver):
-    def __init__(self, subject: ISubject) -> None:
+    def __init__(self, subject: ISubject, fields: Iterable[str] = None, engine: ForecastEngine = None) -> None:
         self.subject = subject
-        self.subject.register(self)
+        self.engine = engine if engine is not None else ForecastEngine()
+        self.subject.register(self, fields)
         
     def update(self):
         print("+---------------------------------------+")
@@ -98,71 +213,83 @@ class ForecastConditions(IObserver):
         self.display()
         
     def display(self):
-        direction = ["+", "-"]
-        random.shuffle(direction)
-        
-        temp_temperature = f"{self.subject.temperature} {direction[0]} {random.randint(0, 40)}"
-        temp_pressure = f"{self.subject.pressure} {direction[0]} {random.randint(0, 100)}"
-        temp_humidity = f"{self.subject.humidity} {direction[0]} {random.randint(0, 10)}"
+        forecast = self.engine.forecast([self.subject.temperature], [self.subject.pressure], [self.subject.humidity])
         
-        new_temperature = temp_temperature if self.subject.temperature is not None else self.subject.temperature
-        new_pressure = temp_pressure if self.subject.pressure is not None else self.subject.pressure
-        new_humidity = temp_humidity if self.subject.humidity is not None else self.subject.humidity
-        
-        forecasted_temperature = f"{eval(new_temperature)}°C" if new_temperature is not None else "Data not Available."
-        forecasted_pressure = f"{eval(new_pressure)}kPa" if new_pressure is not None else "Data not Available."
-        forecasted_humidity = f"{eval(new_humidity)}%" if new_humidity is not None else "Data not Available."
+        forecasted_temperature = f"{forecast.temperature[0]:g}°C" if self.subject.temperature is not None else "Data not Available."
+        forecasted_pressure = f"{forecast.pressure[0]:g}kPa" if self.subject.pressure is not None else "Data not Available."
+        forecasted_humidity = f"{forecast.humidity[0]:g}%" if self.subject.humidity is not None else "Data not Available."
         
         print(f"Forecasted Temperature: {forecasted_temperature}")
         print(f"Forecasted Pressure: {forecasted_pressure}")
         print(f"Forecasted Humidity: {forecasted_humidity}")
-        
-        if self.subject.temperature is not None and eval(new_temperature) < 15:
-            print("It's Going to be Cold.") 
-        elif self.subject.temperature is not None and eval(new_temperature) > self.subject.temperature + 3:
-            print("It's Going to be Hotter.")
-        elif self.subject.temperature is not None and eval(new_temperature) < self.subject.temperature - 3:
-            print("It's Going to be Colder.")
-        else:
-            print("Much of the Same.")
-        
+        print(forecast.outlooks[0].value)
         print()
     
 class WeatherStatistics(IObserver):
-    def __init__(self, subject: ISubject) -> None:
+    UNITS: Dict[str, str] = {"temperature": "°C", "pressure": "kPa", "humidity": "%"}
+
+    def __init__(self, subject: ISubject, fields: Iterable[str] = None, window: float = 3600.0) -> None:
+        # window: seconds of readings the statistics are computed over.
         self.subject = subject
-        self.subject.register(self)
+        self.statistics: Dict[str, RollingStatistics] = {field: RollingStatistics(window) for field in self.UNITS}
+        self.__seen: Dict[str, int] = {}
+        self.subject.register(self, fields)
         
     def update(self):
+        # Only fields set since the last update add a sample.
+        revisions = self.subject.revisions
+        for field, statistics in self.statistics.items():
+            value = getattr(self.subject, field)
+            if value is not None and revisions[field] != self.__seen.get(field):
+                statistics.add(value)
+        self.__seen = revisions
         print("+---------------------------------------+")
         print("----- Weather Statistics Conditions -----")
         self.display()
         
     def display(self):
-        temp_temperature = f"{self.subject.temperature} - {random.randint(0, 40)}"
-        temp_pressure = f"{self.subject.pressure} + {random.randint(0, 100)}"
-        temp_humidity = f"{self.subject.humidity} / {random.randint(0, 10)}"
-        
-        new_temperature = temp_temperature if self.subject.temperature is not None else self.subject.temperature
-        new_pressure = temp_pressure if self.subject.pressure is not None else self.subject.pressure
-        new_humidity = temp_humidity if self.subject.humidity is not None else self.subject.humidity
-        
-        max_temperature = f"{eval(new_temperature)}°C" if new_temperature is not None else "Data not Available."
-        min_pressure = f"{eval(new_pressure)}kPa" if new_pressure is not None else "Data not Available."
-        ave_humidity = f"{eval(new_humidity)}%" if new_humidity is not None else "Data not Available."
-        
-        print(f"Maximum Temperature: {max_temperature}")
-        print(f"Minimum Pressure: {min_pressure}")
-        print(f"Average Humidity: {ave_humidity}\n")
+        for field, statistics in self.statistics.items():
+            unit = self.UNITS[field]
+            if not statistics.count:
+                print(f"{field.title()}: Data not Available.")
+                continue
+            print(
+                f"{field.title()}: Min {statistics.minimum}{unit}, Max {statistics.maximum}{unit}, "
+                f"Average {statistics.mean:.1f}{unit}, 95th Percentile {statistics.percentile(95):.1f}{unit}"
+            )
+        print()
         
-# At Runtime
-weather_subject = WeatherDataSubject()
+if __name__ == "__main__":
+    # At Runtime
+    weather_subject = WeatherDataSubject()
+
+    WeatherConditions(weather_subject)
+    ForecastConditions(weather_subject, fields=["temperature", "pressure"])
+    WeatherStatistics(weather_subject)
+
+    # Updates from Weather Station - One Notification per Reading
+    weather_subject.update(temperature=0, pressure=15, humidity=30)
+
+    with weather_subject.batch():
+        weather_subject.temperature = 21
+        weather_subject.humidity = 45
+
+    # Humidity Only - Forecast is not Subscribed
+    weather_subject.humidity = 50
+
+    # Concurrent Fan-Out - Observers run on a Thread Pool
+    dispatcher = ThreadPoolDispatcher(max_workers=4, capacity=8)
+    station_subject = WeatherDataSubject(dispatcher=dispatcher)
+    station_conditions = WeatherConditions(station_subject)
 
-WeatherConditions(weather_subject)
-ForecastConditions(weather_subject)
-WeatherStatistics(weather_subject)
+    station_subject.update(temperature=18, pressure=101, humidity=60)
+    dispatcher.join()
+    print(dispatcher.metrics()[station_conditions])
+    dispatcher.shutdown()
 
-# Updates from Weather Station
-weather_subject.temperature = 0
-weather_subject.pressure = 15
-weather_subject.humidity = 30
+    # Reading History - Fixed-Memory Time-Series per Station
+    recorded_subject = WeatherDataSubject(history=ReadingHistory(WeatherDataSubject.FIELDS))
+    recorded_subject.update(temperature=12, pressure=100, humidity=70)
+    recorded_subject.update(temperature=14, pressure=99, humidity=65)
+    print(f"Recorded Temperatures: {list(recorded_subject.history.range()['temperature'])}")
+    print(f"History Memory: {recorded_subject.history.nbytes} bytes")
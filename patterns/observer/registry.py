@@ -0,0 +1,81 @@
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, Tuple
+import weakref
+
+if TYPE_CHECKING:
+    from main import IObserver
+
+
+class ObserverRegistry:
+    # Insertion-ordered observer registry with a per-field subscriber index.
+    # add/discard are O(1) per subscribed field. In weak mode observers are held
+    # through weak references and drop out on their own once collected.
+    #
+    # Notification works off a cached snapshot of the subscribers, so observers
+    # may register or deregister while a notification is running: newcomers wait
+    # for the next one, and removed observers are skipped.
+    def __init__(self, fields: Iterable[str], weak: bool = False) -> None:
+        self.__weak = weak
+        self.__observers: Dict[object, FrozenSet[str]] = {}
+        self.__subscribers: Dict[str, Dict[object, None]] = {field: {} for field in fields}
+        self.__snapshots: Dict[FrozenSet[str], Tuple[object, ...]] = {}
+
+    @property
+    def weak(self) -> bool:
+        return self.__weak
+
+    def __len__(self) -> int:
+        return len(self.__observers)
+
+    def __contains__(self, observer: "IObserver") -> bool:
+        return self.__lookup(observer) in self.__observers
+
+    def __iter__(self) -> Iterator["IObserver"]:
+        return self.__live(tuple(self.__observers))
+
+    def add(self, observer: "IObserver", fields: FrozenSet[str]):
+        self.discard(observer)
+        key = weakref.ref(observer, self.__collected) if self.__weak else observer
+        self.__observers[key] = fields
+        for field in fields:
+            self.__subscribers[field][key] = None
+        self.__snapshots.clear()
+
+    def discard(self, observer: "IObserver") -> bool:
+        return self.__remove(self.__lookup(observer))
+
+    def subscribers(self, changed: Iterable[str] = None) -> Iterator["IObserver"]:
+        # Observers subscribed to any of the changed fields, or every observer.
+        changed = frozenset(self.__subscribers if changed is None else changed)
+        snapshot = self.__snapshots.get(changed)
+        if snapshot is None:
+            if len(changed) == len(self.__subscribers):
+                snapshot = tuple(self.__observers)
+            elif len(changed) == 1:
+                snapshot = tuple(self.__subscribers[next(iter(changed))])
+            else:
+                snapshot = tuple(dict.fromkeys(key for field in changed for key in self.__subscribers[field]))
+            self.__snapshots[changed] = snapshot
+        return self.__live(snapshot)
+
+    def __live(self, keys: Tuple[object, ...]) -> Iterator["IObserver"]:
+        for key in keys:
+            if key not in self.__observers:
+                continue
+            observer = key() if self.__weak else key
+            if observer is not None:
+                yield observer
+
+    def __lookup(self, observer: "IObserver") -> object:
+        return weakref.ref(observer) if self.__weak else observer
+
+    def __remove(self, key: object) -> bool:
+        fields = self.__observers.pop(key, None)
+        if fields is None:
+            return False
+        for field in fields:
+            del self.__subscribers[field][key]
+        self.__snapshots.clear()
+        return True
+
+    def __collected(self, key: weakref.ref):
+        self.__remove(key)
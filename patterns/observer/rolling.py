@@ -0,0 +1,147 @@
+from collections import deque
+import math
+import time
+from typing import Deque, Dict, Tuple
+
+
+class QuantileSketch:
+    # Log-bucketed histogram (DDSketch style). Quantiles are accurate to within
+    # relative_accuracy, add/remove are O(1) and memory is bounded by the range
+    # of the values seen rather than by how many were seen.
+    __min_magnitude = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__positive: Dict[int, int] = {}
+        self.__negative: Dict[int, int] = {}
+        self.__zeros = 0
+        self.__count = 0
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    def add(self, value: float):
+        self.__adjust(value, 1)
+
+    def remove(self, value: float):
+        self.__adjust(value, -1)
+
+    def quantile(self, q: float) -> float:
+        if not self.__count:
+            return None
+        rank = max(math.ceil(q * self.__count) - 1, 0)
+        seen = 0
+        for key in sorted(self.__negative, reverse=True):
+            seen += self.__negative[key]
+            if seen > rank:
+                return -self.__value(key)
+        seen += self.__zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.__positive):
+            seen += self.__positive[key]
+            if seen > rank:
+                return self.__value(key)
+        return self.__value(max(self.__positive))
+
+    def __adjust(self, value: float, delta: int):
+        self.__count += delta
+        if abs(value) < self.__min_magnitude:
+            self.__zeros += delta
+            return
+        store = self.__positive if value > 0 else self.__negative
+        key = math.ceil(math.log(abs(value)) / self.__log_gamma)
+        count = store.get(key, 0) + delta
+        if count:
+            store[key] = count
+        else:
+            del store[key]
+
+    def __value(self, key: int) -> float:
+        return 2 * self.__gamma ** key / (self.__gamma + 1)
+
+
+class RollingStatistics:
+    # Sliding time-window statistics for one reading, O(1) amortized per sample.
+    # Only the samples inside the window are kept: min/max come from monotonic
+    # deques, mean/variance from Welford's update (and its inverse on expiry),
+    # and percentiles from a QuantileSketch.
+    def __init__(self, window: float = 3600.0, relative_accuracy: float = 0.01) -> None:
+        self.window = window
+        self.__samples: Deque[Tuple[float, float]] = deque()
+        self.__maxima: Deque[Tuple[int, float]] = deque()
+        self.__minima: Deque[Tuple[int, float]] = deque()
+        self.__sketch = QuantileSketch(relative_accuracy)
+        self.__sequence = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.__samples)
+
+    @property
+    def minimum(self) -> float:
+        return self.__minima[0][1] if self.__minima else None
+
+    @property
+    def maximum(self) -> float:
+        return self.__maxima[0][1] if self.__maxima else None
+
+    @property
+    def mean(self) -> float:
+        return self.__mean if self.__samples else None
+
+    @property
+    def variance(self) -> float:
+        if not self.__samples:
+            return None
+        return self.__m2 / (len(self.__samples) - 1) if len(self.__samples) > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def percentile(self, q: float) -> float:
+        # The sketch answers within its relative error; never outside the data.
+        if not self.__samples:
+            return None
+        return min(max(self.__sketch.quantile(q / 100), self.minimum), self.maximum)
+
+    def add(self, value: float, timestamp: float = None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self.expire(timestamp)
+        sequence = self.__sequence
+        self.__sequence += 1
+        self.__samples.append((timestamp, value))
+        while self.__maxima and self.__maxima[-1][1] <= value:
+            self.__maxima.pop()
+        self.__maxima.append((sequence, value))
+        while self.__minima and self.__minima[-1][1] >= value:
+            self.__minima.pop()
+        self.__minima.append((sequence, value))
+        self.__sketch.add(value)
+        delta = value - self.__mean
+        self.__mean += delta / len(self.__samples)
+        self.__m2 += delta * (value - self.__mean)
+
+    def expire(self, now: float = None):
+        # Drops samples that have fallen out of the window ending at now.
+        now = time.monotonic() if now is None else now
+        while self.__samples and self.__samples[0][0] <= now - self.window:
+            _, value = self.__samples.popleft()
+            oldest = self.__sequence - len(self.__samples)
+            if self.__maxima[0][0] < oldest:
+                self.__maxima.popleft()
+            if self.__minima[0][0] < oldest:
+                self.__minima.popleft()
+            self.__sketch.remove(value)
+            if not self.__samples:
+                self.__mean = self.__m2 = 0.0
+                continue
+            delta = value - self.__mean
+            self.__mean -= delta / len(self.__samples)
+            self.__m2 = max(self.__m2 - delta * (value - self.__mean), 0.0)
@@ -0,0 +1,141 @@
+from array import array
+from bisect import bisect_left
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class _RingView:
+    # Sequence view of one ring column in logical (oldest first) order, for bisect.
+    def __init__(self, column: array, start: int, count: int) -> None:
+        self.column = column
+        self.start = start
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> float:
+        return self.column[(self.start + index) % len(self.column)]
+
+
+class RingBuffer:
+    # Fixed-capacity, array-backed ring of float rows stored column by column.
+    # Once full, every append overwrites the oldest row. Rows must be appended
+    # in non-decreasing timestamp order (the first column).
+    def __init__(self, capacity: int, columns: Sequence[str]) -> None:
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self.__data: Dict[str, array] = {column: array("d", [math.nan]) * capacity for column in self.columns}
+        self.__timestamps = self.__data[self.columns[0]]
+        self.__start = 0
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self.__data.values())
+
+    def append(self, row: Sequence[float]):
+        if self.__count and row[0] < self.__timestamps[(self.__start + self.__count - 1) % self.capacity]:
+            raise ValueError("Readings must be Recorded in Time Order.")
+        if self.__count < self.capacity:
+            index = (self.__start + self.__count) % self.capacity
+            self.__count += 1
+        else:
+            index = self.__start
+            self.__start = (self.__start + 1) % self.capacity
+        for column, value in zip(self.columns, row):
+            self.__data[column][index] = value
+
+    def range(self, start: float = -math.inf, end: float = math.inf) -> Dict[str, array]:
+        # Rows with start <= timestamp < end, as one array per column.
+        view = _RingView(self.__timestamps, self.__start, self.__count)
+        low, high = bisect_left(view, start), bisect_left(view, end)
+        return {column: self.__slice(data, low, high) for column, data in self.__data.items()}
+
+    def __slice(self, data: array, low: int, high: int) -> array:
+        first, last = self.__start + low, self.__start + high
+        if last <= self.capacity:
+            return data[first:last]
+        if first >= self.capacity:
+            return data[first - self.capacity : last - self.capacity]
+        return data[first:] + data[: last - self.capacity]
+
+
+class _Aggregate:
+    # Open bucket of a downsampling tier: per-field min, max, sum and count.
+    def __init__(self, fields: int) -> None:
+        self.bucket: float = None
+        self.minima = [math.inf] * fields
+        self.maxima = [-math.inf] * fields
+        self.sums = [0.0] * fields
+        self.counts = [0] * fields
+
+    def add(self, values: Sequence[float]):
+        for index, value in enumerate(values):
+            if value != value:  # NaN - field not reported
+                continue
+            self.minima[index] = min(self.minima[index], value)
+            self.maxima[index] = max(self.maxima[index], value)
+            self.sums[index] += value
+            self.counts[index] += 1
+
+    def row(self) -> List[float]:
+        row = [self.bucket]
+        for minimum, maximum, total, count in zip(self.minima, self.maxima, self.sums, self.counts):
+            row.extend((minimum, maximum, total / count, count) if count else (math.nan, math.nan, math.nan, 0))
+        return row
+
+
+class ReadingHistory:
+    # Bounded history of timestamped readings for one station: a raw ring plus
+    # downsampled 1-minute and 1-hour rings of min/max/mean/count per field.
+    # Memory is fixed at construction (see nbytes) no matter how long it runs.
+    #
+    # Aggregate tiers only hold closed buckets; the bucket still being filled
+    # appears once a reading lands in the next one. A timestamp earlier than
+    # the last recorded one (e.g. the wall clock stepped back) is clamped to it.
+    TIERS: Tuple[Tuple[str, float], ...] = (("minute", 60.0), ("hour", 3600.0))
+
+    def __init__(
+        self,
+        fields: Iterable[str],
+        raw_capacity: int = 3600,
+        minute_capacity: int = 1440,
+        hour_capacity: int = 720,
+    ) -> None:
+        self.fields = tuple(fields)
+        aggregate_columns = ["timestamp"]
+        for field in self.fields:
+            aggregate_columns.extend((f"{field}_min", f"{field}_max", f"{field}_mean", f"{field}_count"))
+        capacities = {"minute": minute_capacity, "hour": hour_capacity}
+        self.tiers: Dict[str, RingBuffer] = {"raw": RingBuffer(raw_capacity, ("timestamp",) + self.fields)}
+        self.__aggregates: List[Tuple[float, RingBuffer, _Aggregate]] = []
+        for name, width in self.TIERS:
+            self.tiers[name] = RingBuffer(capacities[name], aggregate_columns)
+            self.__aggregates.append((width, self.tiers[name], _Aggregate(len(self.fields))))
+        self.__latest = -math.inf
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tier.nbytes for tier in self.tiers.values())
+
+    def record(self, timestamp: float, values: Sequence[float]):
+        # values: one per field in self.fields, None when not reported.
+        values = [math.nan if value is None else float(value) for value in values]
+        timestamp = self.__latest = max(timestamp, self.__latest)
+        self.tiers["raw"].append([timestamp] + values)
+        for index, (width, tier, aggregate) in enumerate(self.__aggregates):
+            bucket = timestamp - timestamp % width
+            if aggregate.bucket != bucket:
+                if aggregate.bucket is not None:
+                    tier.append(aggregate.row())
+                aggregate = _Aggregate(len(self.fields))
+                aggregate.bucket = bucket
+                self.__aggregates[index] = (width, tier, aggregate)
+            aggregate.add(values)
+
+    def range(self, start: float = -math.inf, end: float = math.inf, tier: str = "raw") -> Dict[str, array]:
+        return self.tiers[tier].range(start, end)
@@ -0,0 +1,38 @@
+import asyncio
+from itertools import count
+import random
+from typing import Dict, NamedTuple
+
+
+class GatewayError(Exception):
+    pass
+
+
+class RailProfile(NamedTuple):
+    latency: float = 0.02  # seconds per charge
+    jitter: float = 0.5  # latency varies by +/- this share
+    failure_rate: float = 0.0
+
+
+# In-process stand-in for the payment gateway: every charge waits the rail's
+# latency (without blocking the event loop) and may fail, so batches can be
+# exercised and timed without a network.
+class LocalGateway:
+    def __init__(self, profiles: Dict[str, RailProfile] = None, seed: int = None) -> None:
+        self.profiles: Dict[str, RailProfile] = dict(profiles or {})
+        self.__random = random.Random(seed)
+        self.__references = count(1)
+
+    def configure(self, rail: str, **changes) -> RailProfile:
+        # e.g. configure("paypal", latency=0.5) to degrade one rail.
+        profile = self.profiles[rail] = self.profiles.get(rail, RailProfile())._replace(**changes)
+        return profile
+
+    async def charge(self, rail: str, amount) -> str:
+        if amount <= 0:
+            raise GatewayError(f"Invalid amount {amount}.")
+        profile = self.profiles.get(rail) or RailProfile()
+        await asyncio.sleep(profile.latency * self.__random.uniform(1 - profile.jitter, 1 + profile.jitter))
+        if self.__random.random() < profile.failure_rate:
+            raise GatewayError(f"{rail} declined the charge.")
+        return f"{rail}-{next(self.__references)}"
@@ -1,24 +1,57 @@
 from abc import ABC, abstractmethod
+import asyncio
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from gateway import GatewayError, LocalGateway, RailProfile
 
 # Define the Payment Behavior Interface:
 class IPaymentStrategy(ABC):
+    rail = "default"
+
     @abstractmethod
     def pay(self, amount):
         pass
 
+    # Charges the gateway without blocking, returning its reference.
+    async def pay_async(self, amount, gateway: LocalGateway) -> str:
+        return await gateway.charge(self.rail, amount)
+
 # Implement Concrete Payment Strategies:
 class CreditCardPayment(IPaymentStrategy):
+    rail = "card"
+
     def pay(self, amount):
         print(f"Paid {amount} using Credit Card")
 
 class PayPalPayment(IPaymentStrategy):
+    rail = "paypal"
+
     def pay(self, amount):
         print(f"Paid {amount} using PayPal")
 
 class CryptoPayment(IPaymentStrategy):
+    rail = "crypto"
+
     def pay(self, amount):
         print(f"Paid {amount} using Cryptocurrency")
 
+# A payment in a batch; strategy None means the processor's current strategy:
+class Payment(NamedTuple):
+    amount: float
+    strategy: Optional[IPaymentStrategy] = None
+
+class PaymentResult(NamedTuple):
+    payment: Payment
+    strategy: IPaymentStrategy
+    reference: Optional[str]
+    error: Optional[str]
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 # Create the Context Class (PaymentProcessor):
 class PaymentProcessor:
     def __init__(self, payment_strategy: IPaymentStrategy):
@@ -30,14 +63,65 @@ class PaymentProcessor:
     def process_payment(self, amount):
         self.payment_strategy.pay(amount)
 
-# Initialize with a Credit Card payment strategy
-payment_processor = PaymentProcessor(CreditCardPayment())
-payment_processor.process_payment(100)  # Output: Paid 100 using Credit Card
+    # Settles payments concurrently: payments are grouped by strategy and all
+    # groups share one pool of `connections` concurrent gateway calls.
+    # Returns one result per payment, in input order; declines and other
+    # strategy errors are reported in the result rather than raised.
+    def process_batch(
+        self, payments: Iterable[Payment], gateway: LocalGateway = None, connections: int = 64
+    ) -> List[PaymentResult]:
+        payments = [payment if isinstance(payment, Payment) else Payment(payment) for payment in payments]
+        groups: Dict[IPaymentStrategy, List[int]] = {}
+        for position, payment in enumerate(payments):
+            groups.setdefault(payment.strategy or self.payment_strategy, []).append(position)
+        return asyncio.run(self.__settle(payments, groups, gateway or LocalGateway(), connections))
+
+    async def __settle(self, payments, groups, gateway, connections) -> List[PaymentResult]:
+        results: List[PaymentResult] = [None] * len(payments)
+        pool = asyncio.Semaphore(connections)
+
+        async def connection(strategy: IPaymentStrategy, positions):
+            for position in positions:
+                payment = payments[position]
+                async with pool:
+                    started = time.perf_counter()
+                    try:
+                        reference, error = await strategy.pay_async(payment.amount, gateway), None
+                    except GatewayError as exc:
+                        reference, error = None, str(exc)
+                    except Exception as exc:
+                        reference, error = None, f"{type(exc).__name__}: {exc}"
+                    latency = time.perf_counter() - started
+                results[position] = PaymentResult(payment, strategy, reference, error, latency)
+
+        # Workers of a group share one iterator, so each takes the next payment
+        # as soon as a connection is free; any group may use the whole pool.
+        workers = []
+        for strategy, positions in groups.items():
+            shared = iter(positions)
+            workers.extend(connection(strategy, shared) for _ in range(min(connections, len(positions))))
+        await asyncio.gather(*workers)
+        return results
+
+if __name__ == "__main__":
+    # Initialize with a Credit Card payment strategy
+    payment_processor = PaymentProcessor(CreditCardPayment())
+    payment_processor.process_payment(100)  # Output: Paid 100 using Credit Card
+
+    # Change to PayPal payment strategy
+    payment_processor.set_payment_strategy(PayPalPayment())
+    payment_processor.process_payment(200)  # Output: Paid 200 using PayPal
 
-# Change to PayPal payment strategy
-payment_processor.set_payment_strategy(PayPalPayment())
-payment_processor.process_payment(200)  # Output: Paid 200 using PayPal
+    # Change to Cryptocurrency payment strategy
+    payment_processor.set_payment_strategy(CryptoPayment())
+    payment_processor.process_payment(300)  # Output: Paid 300 using Cryptocurrency
 
-# Change to Cryptocurrency payment strategy
-payment_processor.set_payment_strategy(CryptoPayment())
-payment_processor.process_payment(300)  # Output: Paid 300 using Cryptocurrency
\ No newline at end of file
+    # Settle a mixed batch concurrently against the local gateway
+    gateway = LocalGateway({"crypto": RailProfile(failure_rate=0.1)}, seed=1)
+    strategies = (CreditCardPayment(), PayPalPayment(), CryptoPayment())
+    batch = [Payment(amount, strategies[amount % 3]) for amount in range(1, 10_001)]
+    started = time.perf_counter()
+    results = payment_processor.process_batch(batch, gateway)
+    failed = sum(not result.ok for result in results)
+    print(f"Settled {len(results):,} payments in {time.perf_counter() - started:.2f}s, {failed} declined")
+    print(results[0])
@@ -0,0 +1,197 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import Counter, deque
+import random
+import time
+from typing import Dict, List, NamedTuple, Sequence
+
+from gateway import GatewayError, LocalGateway
+from main import IPaymentStrategy
+
+
+class StrategySnapshot(NamedTuple):
+    samples: int
+    errors: int
+    error_rate: float
+    mean: float
+    p50: float
+    p95: float
+
+
+# Rolling latency and error record of one strategy: attempts from the last
+# `horizon` seconds, at most `window` of them. Latencies are also kept
+# sorted, so percentiles are a lookup.
+class StrategyStatistics:
+    def __init__(self, window: int = 256, horizon: float = 30.0) -> None:
+        self.window = window
+        self.horizon = horizon
+        self.__attempts = deque()
+        self.__sorted: List[float] = []
+        self.__total = 0.0
+        self.__errors = 0
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self.__attempts)
+
+    def record(self, latency: float, ok: bool):
+        self.expire()
+        if len(self.__attempts) == self.window:
+            self.__drop_oldest()
+        self.__attempts.append((time.monotonic(), latency, ok))
+        insort(self.__sorted, latency)
+        self.__total += latency
+        self.__errors += not ok
+
+    def expire(self):
+        cutoff = time.monotonic() - self.horizon
+        while self.__attempts and self.__attempts[0][0] < cutoff:
+            self.__drop_oldest()
+
+    def __drop_oldest(self):
+        _, latency, ok = self.__attempts.popleft()
+        del self.__sorted[bisect_left(self.__sorted, latency)]
+        self.__total -= latency
+        self.__errors -= not ok
+
+    @property
+    def error_rate(self) -> float:
+        return self.__errors / len(self.__attempts) if self.__attempts else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.__sorted:
+            return 0.0
+        return self.__sorted[round(q / 100 * (len(self.__sorted) - 1))]
+
+    def snapshot(self) -> StrategySnapshot:
+        samples = len(self)
+        return StrategySnapshot(
+            samples,
+            self.__errors,
+            self.error_rate,
+            self.__total / samples if samples else 0.0,
+            self.percentile(50),
+            self.percentile(95),
+        )
+
+
+class IRoutingPolicy(ABC):
+    # Orders the strategies to try for one payment: the first is used and
+    # the rest are fallbacks, in order.
+    @abstractmethod
+    def rank(
+        self, strategies: Sequence[IPaymentStrategy], statistics: Dict[IPaymentStrategy, StrategyStatistics]
+    ) -> List[IPaymentStrategy]:
+        pass
+
+
+class LowestP95Policy(IRoutingPolicy):
+    # min_samples: attempts a strategy needs before its percentiles are trusted;
+    #   until then it is tried first.
+    # max_error_rate: strategies failing more often than this go to the back.
+    # explore: share of payments sent to a random strategy, so a degraded
+    #   rail's statistics recover once it does.
+    def __init__(self, min_samples: int = 20, max_error_rate: float = 0.2, explore: float = 0.02, seed: int = None):
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.explore = explore
+        self.__random = random.Random(seed)
+
+    def rank(self, strategies, statistics):
+        def key(strategy: IPaymentStrategy):
+            stats = statistics[strategy]
+            if len(stats) < self.min_samples:
+                return (0, len(stats))
+            return (1 if stats.error_rate <= self.max_error_rate else 2, stats.percentile(95))
+
+        ranked = sorted(strategies, key=key)
+        if self.explore and self.__random.random() < self.explore:
+            ranked.insert(0, ranked.pop(self.__random.randrange(len(ranked))))
+        return ranked
+
+
+# Payment strategy that routes every payment to one of several strategies
+# according to a policy, falling back to the next strategy when one fails.
+# Statistics are reported per strategy under its rail, numbered ("card#2")
+# when several strategies share a rail.
+class StrategyRouter(IPaymentStrategy):
+    rail = "router"
+
+    def __init__(
+        self,
+        strategies: Sequence[IPaymentStrategy],
+        policy: IRoutingPolicy = None,
+        window: int = 256,
+        horizon: float = 30.0,
+    ) -> None:
+        self.strategies = tuple(strategies)
+        if not self.strategies:
+            raise ValueError("StrategyRouter needs at least one strategy.")
+        if len(set(self.strategies)) != len(self.strategies):
+            raise ValueError("StrategyRouter was given the same strategy twice.")
+        self.policy = policy or LowestP95Policy()
+        self.__statistics = {strategy: StrategyStatistics(window, horizon) for strategy in self.strategies}
+        self.names: Dict[IPaymentStrategy, str] = {}
+        rails = Counter(strategy.rail for strategy in self.strategies)
+        seen = Counter()
+        for strategy in self.strategies:
+            seen[strategy.rail] += 1
+            self.names[strategy] = strategy.rail if rails[strategy.rail] == 1 else f"{strategy.rail}#{seen[strategy.rail]}"
+
+    def statistics(self) -> Dict[str, StrategySnapshot]:
+        return {self.names[strategy]: stats.snapshot() for strategy, stats in self.__statistics.items()}
+
+    def pay(self, amount):
+        error = None
+        for strategy in self.policy.rank(self.strategies, self.__statistics):
+            started = time.perf_counter()
+            try:
+                result = strategy.pay(amount)
+            except Exception as exc:
+                self.__statistics[strategy].record(time.perf_counter() - started, False)
+                error = exc
+                continue
+            self.__statistics[strategy].record(time.perf_counter() - started, True)
+            return result
+        raise error
+
+    async def pay_async(self, amount, gateway: LocalGateway) -> str:
+        error = None
+        for strategy in self.policy.rank(self.strategies, self.__statistics):
+            started = time.perf_counter()
+            try:
+                reference = await strategy.pay_async(amount, gateway)
+            except GatewayError as exc:
+                self.__statistics[strategy].record(time.perf_counter() - started, False)
+                error = exc
+                continue
+            self.__statistics[strategy].record(time.perf_counter() - started, True)
+            return reference
+        raise error
+
+
+if __name__ == "__main__":
+    from gateway import RailProfile
+    from main import CreditCardPayment, CryptoPayment, Payment, PaymentProcessor, PayPalPayment
+
+    gateway = LocalGateway(
+        {"card": RailProfile(latency=0.03), "paypal": RailProfile(latency=0.02), "crypto": RailProfile(latency=0.05)},
+        seed=3,
+    )
+    router = StrategyRouter((CreditCardPayment(), PayPalPayment(), CryptoPayment()), LowestP95Policy(seed=3), horizon=1.0)
+    processor = PaymentProcessor(router)
+
+    def settle(label: str):
+        results = processor.process_batch([Payment(amount) for amount in range(1, 5_001)], gateway)
+        rails = Counter(result.reference.split("-")[0] for result in results if result.ok)
+        latencies = sorted(result.latency for result in results)
+        print(f"{label}: p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.0f}ms, rails {dict(rails)}")
+        for name, snapshot in router.statistics().items():
+            print(f"  {name:<8} p95 {snapshot.p95 * 1000:6.1f}ms errors {snapshot.error_rate:.1%}")
+
+    settle("Healthy")
+    gateway.configure("paypal", latency=0.2, failure_rate=0.3)
+    settle("PayPal degraded")
+    gateway.configure("paypal", latency=0.02, failure_rate=0.0)
+    time.sleep(1.0)
+    settle("PayPal recovered")